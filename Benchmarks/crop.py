@@ -0,0 +1,43 @@
+import sys
+import time
+
+import numpy as np
+
+import ximu3csv
+from ximu3csv.crop import crop_message
+
+
+def main() -> None:
+    number_of_rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10_000_000
+
+    rng = np.random.default_rng(0)
+
+    csv = np.column_stack((np.arange(number_of_rows) * 2500.0, rng.normal(0, 1, (number_of_rows, 6))))  # 400 Hz inertial
+
+    monotonic = ximu3csv.data_messages.Inertial(csv, np.empty([0, 1]))
+
+    swapped = csv.copy()
+    swapped[[0, 1]] = swapped[[1, 0]]  # a single out of order row
+
+    non_monotonic = ximu3csv.data_messages.Inertial(swapped, np.empty([0, 1]))
+
+    last_timestamp = csv[-1, 0]
+
+    for window in (0.1, 0.5, 0.9):
+        start = last_timestamp * (1 - window) / 2
+        stop = last_timestamp - start
+
+        for name, message, non_monotonic_option in (
+            ("searchsorted", monotonic, "mask"),
+            ("mask", non_monotonic, "mask"),
+            ("sort", non_monotonic, "sort"),
+        ):
+            time_start = time.perf_counter()
+
+            cropped = crop_message(message, start, stop, non_monotonic_option)
+
+            print(f"{number_of_rows} rows  {window:4.0%} window  {name:<12} {time.perf_counter() - time_start:8.4f} s  {len(cropped.timestamp)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from synthetic import write_session
+
+HEAVY_MODULES = ("scipy", "pandas", "pyarrow", "h5py", "sqlite3", "concurrent.futures.process", "importlib.metadata")  # only imported by the features that need them
+
+IMPORT = "import time; start = time.perf_counter(); import ximu3csv; print(time.perf_counter() - start)"
+
+CHECK = """
+import sys
+import ximu3csv
+
+devices = ximu3csv.read(sys.argv[1])
+devices = ximu3csv.crop(devices, 1e6, 2e6)
+devices = ximu3csv.zero_first_timestamp(devices)
+devices = ximu3csv.resample(devices, 100)
+devices = ximu3csv.zero_heading(devices)
+devices = ximu3csv.convert_to_euler_angles(devices)
+
+print(" ".join(m for m in sys.argv[2:] if m in sys.modules))
+"""
+
+
+def main() -> int:
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    durations = [float(subprocess.run([sys.executable, "-c", IMPORT], capture_output=True, text=True, check=True).stdout) for _ in range(repeats)]
+
+    print(f"import ximu3csv  {min(durations) * 1e3:8.1f} ms (fastest of {repeats})")
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_session(Path(directory), 1, 3)
+
+        imported = subprocess.run([sys.executable, "-c", CHECK, directory, *HEAVY_MODULES], capture_output=True, text=True, check=True).stdout.split()
+
+    if imported:
+        print(f"Unexpected imports after read and processing: {', '.join(imported)}")
+        return 1
+
+    print(f"None of {', '.join(HEAVY_MODULES)} imported after read and processing")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
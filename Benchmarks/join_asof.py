@@ -0,0 +1,56 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import ximu3csv
+from synthetic import write_session
+
+COLUMNS = ["percentage", "voltage", "charging_status"]
+
+DIRECTIONS = {"backward": "previous", "nearest": "nearest"}  # pandas.merge_asof direction: interpolation
+
+
+def main() -> int:
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 60
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_session(Path(directory), 2, duration)
+
+        devices = sorted(ximu3csv.read(directory), key=lambda d: d.serial_number)
+
+    battery = devices[1].battery
+
+    timestamp = np.arange(battery.timestamp[0] - 1e6, battery.timestamp[-1] + 1e6, 2500.0)  # starts before and ends after the battery samples
+
+    failures = 0
+
+    for direction, policy in DIRECTIONS.items():
+        for tolerance in (None, 1e5):
+            start = time.perf_counter()
+
+            joined = ximu3csv.join_asof(devices[1:], timestamp, ximu3csv.DataMessageType.BATTERY, dict.fromkeys(COLUMNS, policy), tolerance)[0].battery
+
+            duration = time.perf_counter() - start
+
+            expected = pd.merge_asof(pd.DataFrame({"timestamp": timestamp}), battery.to_dataframe().reset_index(), on="timestamp", direction=direction, tolerance=tolerance)
+
+            mismatches = int((~np.isclose(joined._csv[:, 1:], expected[COLUMNS].to_numpy(), equal_nan=True)).any(axis=1).sum())
+
+            failures += mismatches > 0
+
+            print(f"{direction:<10} tolerance {str(tolerance):<10} {duration * 1e3:8.2f} ms  {mismatches:>6} of {len(timestamp)} rows differ from pandas.merge_asof")
+
+    start = time.perf_counter()
+
+    ximu3csv.resample(devices, 1e6 / 2500)
+
+    print(f"resample all messages {(time.perf_counter() - start) * 1e3:8.2f} ms")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+import ximu3csv
+from synthetic import write_session
+
+
+def __chained(devices: list[ximu3csv.Device], start: int, stop: int) -> list[ximu3csv.Device]:
+    devices = ximu3csv.crop(devices, start, stop)
+    devices = ximu3csv.zero_first_timestamp(devices)
+    devices = ximu3csv.resample(devices, 100)
+    devices = ximu3csv.zero_heading(devices, 1_000_000)
+
+    return ximu3csv.convert_to_euler_angles(devices)
+
+
+def __pipeline(devices: list[ximu3csv.Device], start: int, stop: int) -> list[ximu3csv.Device]:
+    return ximu3csv.Pipeline().crop(start, stop).zero_first_timestamp().resample(100).zero_heading(1_000_000).convert_to_euler_angles().run(devices)
+
+
+def __measure(function: Callable, devices: list[ximu3csv.Device], start: int, stop: int) -> tuple[float, int]:
+    tracemalloc.start()
+
+    time_start = time.perf_counter()
+
+    function(devices, start, stop)
+
+    duration = time.perf_counter() - time_start
+
+    _, peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    return duration, peak
+
+
+def main() -> None:
+    number_of_devices = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_session(directory, number_of_devices, duration)
+
+        devices = ximu3csv.read(directory)
+
+    first_timestamp = min(d.first_timestamp for d in devices)
+
+    start = first_timestamp + 1_000_000
+    stop = first_timestamp + int(duration * 1e6) - 1_000_000
+
+    for name, function in (("chained", __chained), ("pipeline", __pipeline)):
+        seconds, peak = __measure(function, devices, start, stop)
+
+        print(f"{number_of_devices} devices  {duration:g} s  {name:<10} {seconds:8.3f} s  {peak / 1e6:8.1f} MB peak")
+
+
+if __name__ == "__main__":
+    main()
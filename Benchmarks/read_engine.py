@@ -0,0 +1,47 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import ximu3csv
+
+HEADER = "Timestamp (us),Gyroscope X (deg/s),Gyroscope Y (deg/s),Gyroscope Z (deg/s),Accelerometer X (g),Accelerometer Y (g),Accelerometer Z (g)\n"
+
+
+def write_inertial(file_path: Path, number_of_rows: int) -> None:
+    chunk_rows = 1_000_000
+
+    with file_path.open("w") as file:
+        file.write(HEADER)
+
+        for start in range(0, number_of_rows, chunk_rows):
+            rows = min(chunk_rows, number_of_rows - start)
+
+            csv = np.column_stack(((start + np.arange(rows)) * 2500, np.random.uniform(-1, 1, (rows, 6))))
+
+            np.savetxt(file, csv, fmt=["%d"] + ["%.6f"] * 6, delimiter=",")
+
+
+def main() -> None:
+    sizes = [int(float(a)) for a in sys.argv[1:]] or [1_000_000]
+
+    for number_of_rows in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            device_directory = Path(directory) / "x-IMU3 - 01234567"
+            device_directory.mkdir()
+
+            write_inertial(device_directory / "Inertial.csv", number_of_rows)
+
+            for engine in ximu3csv.parse.ENGINES:
+                start = time.perf_counter()
+
+                ximu3csv.read(directory, ximu3csv.DataMessageType.INERTIAL, engine=engine)
+
+                duration = time.perf_counter() - start
+
+                print(f"{number_of_rows:>12,} rows  {engine:<12}  {duration:8.3f} s  {number_of_rows / duration:14,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
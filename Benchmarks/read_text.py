@@ -0,0 +1,48 @@
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import ximu3csv
+
+
+def write_notification(file_path: Path, number_of_lines: int) -> None:
+    with file_path.open("w") as file:
+        file.write("Timestamp (us),String\n")
+        file.writelines(f"{i * 1000},Notification {i}, value {i % 100}\n" for i in range(number_of_lines))  # strings contain commas
+
+
+def genfromtxt(file_path: Path) -> None:  # previous implementation, parses the file twice
+    data = file_path.read_bytes().split(b"\n", 1)[1]
+
+    np.genfromtxt(io.BytesIO(data), delimiter=",", ndmin=2)
+    np.genfromtxt(io.StringIO(data.decode()), delimiter=",", usecols=1, dtype=None, encoding=None, ndmin=1)
+
+
+def main() -> None:
+    sizes = [int(float(a)) for a in sys.argv[1:]] or [1_000_000]
+
+    for number_of_lines in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            device_directory = Path(directory) / "x-IMU3 - 01234567"
+            device_directory.mkdir()
+
+            write_notification(device_directory / "Notification.csv", number_of_lines)
+
+            for name, function in (
+                ("read", lambda: ximu3csv.read(directory, ximu3csv.DataMessageType.NOTIFICATION)),
+                ("genfromtxt", lambda: genfromtxt(device_directory / "Notification.csv")),
+            ):
+                start = time.perf_counter()
+
+                function()
+
+                duration = time.perf_counter() - start
+
+                print(f"{number_of_lines:>12,} lines  {name:<12}  {duration:8.3f} s  {number_of_lines / duration:14,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import sys
+import tempfile
+import time
+
+import numpy as np
+import scipy
+import ximu3csv
+from synthetic import write_session
+
+LINEAR = (
+    ximu3csv.DataMessageType.INERTIAL,
+    ximu3csv.DataMessageType.MAGNETOMETER,
+    ximu3csv.DataMessageType.HIGH_G_ACCELEROMETER,
+    ximu3csv.DataMessageType.TEMPERATURE,
+    ximu3csv.DataMessageType.BATTERY,
+    ximu3csv.DataMessageType.RSSI,
+    ximu3csv.DataMessageType.SERIAL_ACCESSORY,
+)
+
+ORIENTATION = (
+    ximu3csv.DataMessageType.QUATERNION,
+    ximu3csv.DataMessageType.ROTATION_MATRIX,
+    ximu3csv.DataMessageType.EULER_ANGLES,
+    ximu3csv.DataMessageType.LINEAR_ACCELERATION,
+    ximu3csv.DataMessageType.EARTH_ACCELERATION,
+)
+
+INTERPOLATION = {"charging_status": "linear"}  # all columns linear as in the previous implementation
+
+
+def __extrapolate(time: np.ndarray, values: np.ndarray, new_time: np.ndarray) -> tuple[np.ndarray, np.ndarray]:  # previous implementation
+    if new_time[0] < time[0]:
+        time = np.concatenate(([new_time[0]], time))
+        values = np.concatenate(([values[0, :]], values))
+
+    if new_time[-1] > time[-1]:
+        time = np.concatenate((time, [new_time[-1]]))
+        values = np.concatenate((values, [values[-1, :]]))
+
+    return time, values
+
+
+def __interpolate(time: np.ndarray, values: np.ndarray, new_time: np.ndarray) -> np.ndarray:  # previous implementation
+    time, values = __extrapolate(time, values, new_time)
+
+    return scipy.interpolate.interp1d(time, values, axis=0)(new_time)
+
+
+def __previous(devices: list[ximu3csv.Device], timestamp: np.ndarray) -> list[list[np.ndarray]]:
+    messages = [[getattr(d, t.name.lower()) for t in LINEAR] for d in devices]
+
+    return [[__interpolate(m.timestamp / 1e6, m._csv[:, 1:], timestamp / 1e6) for m in d if len(m.timestamp) > 0] for d in messages]
+
+
+def __current(devices: list[ximu3csv.Device], sample_rate: float) -> list[list[np.ndarray]]:
+    devices = ximu3csv.resample(devices, sample_rate, INTERPOLATION)
+
+    return [[getattr(d, t.name.lower())._csv[:, 1:] for t in LINEAR if len(getattr(d, t.name.lower()).timestamp) > 0] for d in devices]
+
+
+def main() -> int:
+    number_of_devices = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_session(directory, number_of_devices, duration)
+
+        sessions = {
+            "linear": ximu3csv.read(directory, LINEAR),
+            "orientation": ximu3csv.read(directory, ORIENTATION),
+            "all": ximu3csv.read(directory),
+        }
+
+    failures = 0
+
+    for sample_rate in (100, 1000):
+        devices = sessions["linear"]
+
+        timestamp = ximu3csv.resample(devices, sample_rate)[0].inertial.timestamp
+
+        durations = {}
+
+        for name, function in (("previous", lambda: __previous(devices, timestamp)), ("current", lambda: __current(devices, sample_rate))):
+            start = time.perf_counter()
+
+            results = function()
+
+            durations[name] = time.perf_counter() - start
+
+            print(f"{number_of_devices} devices  {duration:g} s  {'linear':<12} {sample_rate:>5} Hz  {name:<10} {durations[name]:8.3f} s")
+
+            if name == "previous":
+                expected = results
+            elif not all(np.allclose(r, e, equal_nan=True) for rs, es in zip(results, expected) for r, e in zip(rs, es)):
+                failures += 1
+
+                print("Current results differ from the previous implementation")
+
+        print(f"{number_of_devices} devices  {duration:g} s  {'linear':<12} {sample_rate:>5} Hz  {'speedup':<10} {durations['previous'] / durations['current']:7.1f}x")
+
+    for name in ("orientation", "all"):
+        for sample_rate in (100, 1000):
+            start = time.perf_counter()
+
+            ximu3csv.resample(sessions[name], sample_rate)
+
+            print(f"{number_of_devices} devices  {duration:g} s  {name:<12} {sample_rate:>5} Hz  {'current':<10} {time.perf_counter() - start:8.3f} s")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
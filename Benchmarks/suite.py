@@ -0,0 +1,133 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import ximu3csv
+from synthetic import write_session
+
+
+def __number_of_rows(devices: list[ximu3csv.Device]) -> int:
+    return sum(len(getattr(d, t.name.lower()).timestamp) for d in devices for t in ximu3csv.DataMessageType)
+
+
+def __uncached(devices: list[ximu3csv.Device]) -> list[ximu3csv.Device]:
+    return [replace(d, **{t.name.lower(): replace(getattr(d, t.name.lower())) for t in ximu3csv.DataMessageType}) for d in devices]  # new messages do not share cached properties
+
+
+def __measure(function: Callable[[list[ximu3csv.Device]], Any], devices: list[ximu3csv.Device], repeats: int) -> tuple[float, int]:
+    durations = []
+
+    for _ in range(repeats):
+        uncached = __uncached(devices)  # each run starts cold rather than reusing caches filled by earlier runs and stages
+
+        start = time.perf_counter()
+
+        function(uncached)
+
+        durations.append(time.perf_counter() - start)
+
+    uncached = __uncached(devices)
+
+    tracemalloc.start()  # separate run so that tracing does not affect the timing
+
+    function(uncached)
+
+    _, peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    return min(durations), peak
+
+
+def __stages(directory: Path, devices: list[ximu3csv.Device], output: Path) -> dict[str, Callable[[list[ximu3csv.Device]], Any]]:
+    first_timestamp = min(d.first_timestamp for d in devices)
+    last_timestamp = max(d.last_timestamp for d in devices)
+
+    start = first_timestamp + (last_timestamp - first_timestamp) / 4
+    stop = last_timestamp - (last_timestamp - first_timestamp) / 4
+
+    return {
+        "read": lambda _: ximu3csv.read(directory),
+        "read (workers=None)": lambda _: ximu3csv.read(directory, workers=None),
+        "read (compact)": lambda _: ximu3csv.read(directory, compact=True),
+        "read (window)": lambda _: ximu3csv.read(directory, start=start, stop=stop),
+        "crop": lambda d: ximu3csv.crop(d, start, stop),
+        "zero_first_timestamp": lambda d: ximu3csv.zero_first_timestamp(d),
+        "resample (100 Hz)": lambda d: ximu3csv.resample(d, 100),
+        "zero_heading": lambda d: ximu3csv.zero_heading(d, start),
+        "convert_to_euler_angles": lambda d: ximu3csv.convert_to_euler_angles(d),
+        "pipeline": lambda d: ximu3csv.Pipeline().crop(start, stop).zero_first_timestamp().resample(100).zero_heading().convert_to_euler_angles().run(d),
+        "write (npz)": lambda d: ximu3csv.write(d, output, "npz"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time each public function on synthetic sessions.")
+
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10], help="numbers of devices")
+    parser.add_argument("--durations", type=float, nargs="+", default=[60], help="session durations in seconds")
+    parser.add_argument("--repeats", type=int, default=3, help="the fastest of repeated runs is reported")
+    parser.add_argument("--output", type=Path, help="JSON file to which results are written, defaults to stdout")
+
+    arguments = parser.parse_args()
+
+    results = []
+
+    for number_of_devices in arguments.devices:
+        for duration in arguments.durations:
+            with tempfile.TemporaryDirectory() as directory:
+                directory = Path(directory)
+
+                session = directory / "Session"
+
+                write_session(session, number_of_devices, duration)
+
+                size = sum(p.stat().st_size for p in session.rglob("*.csv"))
+
+                devices = ximu3csv.read(session)
+
+                number_of_rows = __number_of_rows(devices)
+
+                for stage, function in __stages(session, devices, directory / "Output").items():
+                    seconds, peak = __measure(function, devices, arguments.repeats)
+
+                    results.append(
+                        {
+                            "stage": stage,
+                            "devices": number_of_devices,
+                            "duration": duration,
+                            "rows": number_of_rows,
+                            "bytes": size,
+                            "seconds": seconds,
+                            "rows_per_second": number_of_rows / seconds,
+                            "peak_memory": peak,
+                        }
+                    )
+
+                    print(f"{number_of_devices:>3} devices  {duration:6g} s  {stage:<24} {seconds:8.3f} s  {number_of_rows / seconds:14,.0f} rows/s  {peak / 1e6:8.1f} MB", file=sys.stderr)
+
+    report = {
+        "version": ximu3csv.cache.version(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if arguments.output is None:
+        print(json.dumps(report, indent=4))
+    else:
+        with arguments.output.open("w") as file:
+            json.dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import scipy
+
+HEADERS = {
+    "Inertial": "Timestamp (us),Gyroscope X (deg/s),Gyroscope Y (deg/s),Gyroscope Z (deg/s),Accelerometer X (g),Accelerometer Y (g),Accelerometer Z (g)",
+    "Magnetometer": "Timestamp (us),X (a.u.),Y (a.u.),Z (a.u.)",
+    "Quaternion": "Timestamp (us),W,X,Y,Z",
+    "RotationMatrix": "Timestamp (us),XX,XY,XZ,YX,YY,YZ,ZX,ZY,ZZ",
+    "EulerAngles": "Timestamp (us),Roll (deg),Pitch (deg),Yaw (deg)",
+    "LinearAcceleration": "Timestamp (us),Quaternion W,Quaternion X,Quaternion Y,Quaternion Z,Acceleration X (g),Acceleration Y (g),Acceleration Z (g)",
+    "EarthAcceleration": "Timestamp (us),Quaternion W,Quaternion X,Quaternion Y,Quaternion Z,Acceleration X (g),Acceleration Y (g),Acceleration Z (g)",
+    "AhrsStatus": "Timestamp (us),Initialising,Angular Rate Recovery,Acceleration Recovery,Magnetic Recovery",
+    "HighGAccelerometer": "Timestamp (us),X (g),Y (g),Z (g)",
+    "Temperature": "Timestamp (us),Temperature (degC)",
+    "Battery": "Timestamp (us),Percentage (%),Voltage (V),Charging Status",
+    "Rssi": "Timestamp (us),Percentage (%),Power (dBm)",
+    "SerialAccessory": "Timestamp (us),A,B,C",
+    "Notification": "Timestamp (us),String",
+    "Error": "Timestamp (us),String",
+}
+
+RATES = {  # Hz
+    "Inertial": 400,
+    "Magnetometer": 20,
+    "Quaternion": 400,
+    "RotationMatrix": 400,
+    "EulerAngles": 400,
+    "LinearAcceleration": 400,
+    "EarthAcceleration": 400,
+    "AhrsStatus": 10,
+    "HighGAccelerometer": 400,
+    "Temperature": 5,
+    "Battery": 5,
+    "Rssi": 5,
+    "SerialAccessory": 1,
+    "Notification": 1,
+    "Error": 0.1,
+}
+
+
+def __timestamps(rng: np.random.Generator, first_timestamp: int, rate: float, duration: float) -> np.ndarray:
+    period = 1e6 / rate
+
+    return (first_timestamp + np.arange(int(duration * rate)) * period + rng.integers(0, 20, int(duration * rate))).astype(np.int64)  # monotonic with jitter
+
+
+def __rotations(rng: np.random.Generator, number_of_samples: int) -> scipy.spatial.transform.Rotation:
+    rotation_vectors = np.cumsum(rng.normal(0, 0.01, (number_of_samples, 3)), axis=0)  # random walk
+
+    return scipy.spatial.transform.Rotation.from_rotvec(rotation_vectors)
+
+
+def __values(rng: np.random.Generator, name: str, number_of_samples: int) -> np.ndarray:
+    match name:
+        case "Quaternion":
+            return __rotations(rng, number_of_samples).as_quat()[:, [3, 0, 1, 2]]
+        case "RotationMatrix":
+            return __rotations(rng, number_of_samples).as_matrix().reshape(-1, 9)
+        case "EulerAngles":
+            return __rotations(rng, number_of_samples).as_euler("ZYX", degrees=True)[:, [2, 1, 0]]
+        case "LinearAcceleration" | "EarthAcceleration":
+            return np.column_stack((__rotations(rng, number_of_samples).as_quat()[:, [3, 0, 1, 2]], rng.normal(0, 0.1, (number_of_samples, 3))))
+        case "AhrsStatus":
+            return rng.integers(0, 2, (number_of_samples, 4))
+        case "Battery":
+            return np.column_stack((rng.uniform(0, 100, number_of_samples), rng.uniform(3.3, 4.2, number_of_samples), rng.integers(0, 3, number_of_samples)))
+        case _:
+            return rng.normal(0, 1, (number_of_samples, HEADERS[name].count(",")))
+
+
+def write_device(directory: Path, serial_number: str, duration: float, rates: dict[str, float] = RATES, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with (directory / "Command.json").open("w") as file:
+        json.dump([{"ping": {"interface": "USB", "name": "x-IMU3", "sn": serial_number}}, {"time": "2025-01-01 12:00:00"}], file)
+
+    first_timestamp = int(rng.integers(1_000_000, 2_000_000))
+
+    timestamps_by_rate = {rate: __timestamps(rng, first_timestamp, rate, duration) for rate in set(rates.values())}  # messages of the same rate share timestamps
+
+    for name, rate in rates.items():
+        timestamps = timestamps_by_rate[rate]
+
+        with (directory / f"{name}.csv").open("w") as file:
+            file.write(HEADERS[name] + "\n")
+
+            if name in ("Notification", "Error"):
+                file.writelines(f"{t},{name} {i}\n" for i, t in enumerate(timestamps))
+            else:
+                values = __values(rng, name, len(timestamps))
+
+                np.savetxt(file, np.column_stack((timestamps, values)), fmt=["%d"] + ["%.6f"] * values.shape[1], delimiter=",")
+
+
+def write_session(directory: Path, number_of_devices: int, duration: float, rates: dict[str, float] = RATES) -> None:
+    for index in range(number_of_devices):
+        serial_number = f"{index:08X}"
+
+        write_device(Path(directory) / f"x-IMU3 - {serial_number}", serial_number, duration, rates, seed=index)
+
+
+def main() -> None:
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("Synthetic Session")
+    number_of_devices = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 60
+
+    write_session(directory, number_of_devices, duration)
+
+
+if __name__ == "__main__":
+    main()
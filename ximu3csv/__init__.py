@@ -1,8 +1,15 @@
+from .catalog import Catalog
 from .convert_to_euler_angles import convert_to_euler_angles
-from .crop import crop
+from .crop import crop, crop_chunks
 from .data_messages import DataMessageType
+from .dataframe import to_dataframe
 from .device import Device
+from .instrumentation import profile
+from .iter_chunks import iter_chunks
+from .pipeline import Pipeline
 from .read import read
-from .resample import resample
-from .zero_first_timestamp import zero_first_timestamp
-from .zero_heading import zero_heading
+from .resample import join_asof, resample
+from .session import Session
+from .write import write
+from .zero_first_timestamp import zero_first_timestamp, zero_first_timestamp_chunks
+from .zero_heading import zero_heading, zero_heading_chunks
@@ -0,0 +1,46 @@
+import argparse
+import glob
+import sys
+from pathlib import Path
+
+from .batch import batch
+from .binary import FORMATS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m ximu3csv", description="Process logged sessions and write the results in a binary format.")
+
+    parser.add_argument("sessions", help='glob of session directories, e.g. "Logged Data/*"')
+    parser.add_argument("--output", type=Path, required=True, help="directory to which processed sessions are written")
+    parser.add_argument("--format", choices=tuple(FORMATS), default="npz")
+    parser.add_argument("--crop", type=float, nargs=2, metavar=("START", "STOP"), help="crop window in microseconds")
+    parser.add_argument("--zero-first-timestamp", action="store_true")
+    parser.add_argument("--resample", type=float, metavar="SAMPLE_RATE", help="sample rate in Hz")
+    parser.add_argument("--zero-heading", type=float, nargs=2, metavar=("TIMESTAMP", "OFFSET"), help="timestamp in microseconds and heading offset in degrees")
+    parser.add_argument("--euler-angles", action="store_true", help="convert orientation to Euler angles")
+    parser.add_argument("--workers", type=int, help="number of sessions processed in parallel, defaults to the number of CPUs")
+    parser.add_argument("--force", action="store_true", help="process sessions even if outputs are up to date")
+
+    arguments = parser.parse_args()
+
+    sessions = sorted(Path(p).resolve() for p in glob.glob(arguments.sessions) if Path(p).is_dir())
+
+    if not sessions:
+        print(f'No session directories match "{arguments.sessions}"')
+        return 1
+
+    recipe = {
+        "crop": arguments.crop,
+        "zero_first_timestamp": arguments.zero_first_timestamp,
+        "resample": arguments.resample,
+        "zero_heading": arguments.zero_heading,
+        "convert_to_euler_angles": arguments.euler_angles,
+    }
+
+    failures = batch(sessions, arguments.output.resolve(), arguments.format, recipe, arguments.workers, arguments.force)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from .pipeline import Pipeline
+from .read import read
+from .write import write
+
+MANIFEST_NAME = "ximu3csv.json"  # written to each output directory once complete
+
+
+def __pipeline(recipe: dict[str, Any]) -> Pipeline:
+    pipeline = Pipeline()
+
+    if recipe.get("crop") is not None:
+        pipeline.crop(*recipe["crop"])
+
+    if recipe.get("zero_first_timestamp"):
+        pipeline.zero_first_timestamp()
+
+    if recipe.get("resample") is not None:
+        pipeline.resample(recipe["resample"])
+
+    if recipe.get("zero_heading") is not None:
+        pipeline.zero_heading(*recipe["zero_heading"])
+
+    if recipe.get("convert_to_euler_angles"):
+        pipeline.convert_to_euler_angles()
+
+    return pipeline
+
+
+def __manifest(session: Path, format: str, recipe: dict[str, Any]) -> dict[str, Any]:
+    files = [p.stat() for p in session.rglob("*") if p.is_file() and ".ximu3cache" not in p.parts]
+
+    return {
+        "format": format,
+        "recipe": recipe,
+        "size": sum(s.st_size for s in files),
+        "mtime": max((s.st_mtime_ns for s in files), default=0),
+    }
+
+
+def is_up_to_date(session: Path, output: Path, format: str, recipe: dict[str, Any]) -> bool:
+    try:
+        with (output / MANIFEST_NAME).open() as file:
+            return json.load(file) == __manifest(session, format, recipe)
+    except (OSError, ValueError):
+        return False
+
+
+def process_session(session: Path, output: Path, format: str, recipe: dict[str, Any]) -> float:
+    start = time.perf_counter()
+
+    manifest = __manifest(session, format, recipe)  # before reading so that files modified during processing are processed again
+
+    (output / MANIFEST_NAME).unlink(missing_ok=True)
+
+    devices = __pipeline(recipe).run(read(session))
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix=f".{output.name}.", dir=output.parent) as staging:  # sibling so that the output can be replaced by a rename
+        staged = Path(staging) / output.name
+
+        write(devices, staged, format)
+
+        with (staged / MANIFEST_NAME).open("w") as file:
+            json.dump(manifest, file, indent=4)
+
+        shutil.rmtree(output, ignore_errors=True)  # files from an earlier recipe or format would otherwise remain
+
+        staged.rename(output)
+
+    return time.perf_counter() - start
+
+
+def batch(sessions: list[Path], output: Path, format: str, recipe: dict[str, Any], workers: int | None = None, force: bool = False) -> int:
+    root = Path(os.path.commonpath([s.parent for s in sessions])) if sessions else output
+
+    outputs = {s: output / s.relative_to(root) for s in sessions}  # mirrors session paths so that sessions with the same name have separate outputs
+
+    pending = [s for s in sessions if force or not is_up_to_date(s, outputs[s], format, recipe)]
+
+    for session in sessions:
+        if session not in pending:
+            print(f"Skipped {session} (up to date)")
+
+    failures = 0
+
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {executor.submit(process_session, s, outputs[s], format, recipe): s for s in pending}
+
+        for count, future in enumerate(as_completed(futures), 1):
+            session = futures[future]
+
+            try:
+                print(f"[{count}/{len(pending)}] {session} {future.result():.2f} s")
+            except Exception as error:
+                failures += 1
+
+                print(f"[{count}/{len(pending)}] Unable to process {session}: {error}")
+
+    print(f"Processed {len(pending) - failures} of {len(sessions)} sessions in {time.perf_counter() - start:.2f} s")
+
+    return failures
@@ -0,0 +1,141 @@
+import io
+from pathlib import Path
+
+import numpy as np
+
+from .compression import ArchivePath
+from .data_messages import DataMessage
+from .optional import import_optional
+
+FORMATS = {  # format: file extension
+    "npz": ".npz",
+    "parquet": ".parquet",
+    "hdf5": ".h5",
+}
+
+CHUNK_ROWS = 2**16  # rows per parquet row group and HDF5 chunk
+
+
+def __format(file_path: Path) -> str:
+    for format, suffix in FORMATS.items():
+        if file_path.suffix == suffix:
+            return format
+
+    raise ValueError(f'"{file_path}" is not a supported format')
+
+
+def __write_npz(file_path: Path, columns: dict[str, np.ndarray]) -> None:
+    np.savez_compressed(file_path, **columns)
+
+
+def __read_npz(file_path: Path, names: list[str] | None = None) -> dict[str, np.ndarray]:
+    with np.load(file_path) as file:
+        return {n: file[n] for n in (names or file.files)}  # members are decompressed individually
+
+
+def __write_parquet(file_path: Path, columns: dict[str, np.ndarray]) -> None:
+    pyarrow = import_optional("pyarrow", 'Format "parquet"')
+    parquet = import_optional("pyarrow.parquet", 'Format "parquet"')
+
+    table = pyarrow.table({n: pyarrow.array(c) for n, c in columns.items()})
+
+    parquet.write_table(table, file_path, compression="zstd", row_group_size=CHUNK_ROWS)
+
+
+def __read_parquet(file_path: Path, names: list[str] | None = None) -> dict[str, np.ndarray]:
+    parquet = import_optional("pyarrow.parquet", 'Format "parquet"')
+
+    table = parquet.read_table(file_path, columns=names)
+
+    columns = {n: table.column(n).to_numpy() for n in table.column_names}
+
+    if "string" in columns:
+        columns["string"] = columns["string"].astype(str)
+
+    return columns
+
+
+def __write_hdf5(file_path: Path, columns: dict[str, np.ndarray]) -> None:
+    h5py = import_optional("h5py", 'Format "hdf5"')
+
+    with h5py.File(file_path, "w") as file:
+        for name, column in columns.items():
+            if column.dtype.kind == "U":
+                file.create_dataset(name, data=column.astype(object), dtype=h5py.string_dtype(), chunks=(CHUNK_ROWS,), maxshape=(None,), compression="gzip")
+            else:
+                file.create_dataset(name, data=column, chunks=(CHUNK_ROWS,), maxshape=(None,), compression="gzip")
+
+        file.attrs["columns"] = list(columns)  # HDF5 does not preserve dataset order
+
+
+def __read_hdf5(file_path: Path, names: list[str] | None = None) -> dict[str, np.ndarray]:
+    h5py = import_optional("h5py", 'Format "hdf5"')
+
+    with h5py.File(file_path, "r") as file:
+        columns = {}
+
+        for name in names or list(file.attrs["columns"]):
+            dataset = file[name]
+
+            if h5py.check_string_dtype(dataset.dtype) is not None:
+                columns[name] = dataset.asstr()[()].astype(str)
+            else:
+                columns[name] = dataset[()]
+
+        return columns
+
+
+def write_message(file_path: Path, message: DataMessage, format: str) -> None:
+    match format:
+        case "npz":
+            __write_npz(file_path, message._columns())
+        case "parquet":
+            __write_parquet(file_path, message._columns())
+        case "hdf5":
+            __write_hdf5(file_path, message._columns())
+
+
+def __read_columns(file_path: Path, names: list[str] | None = None) -> dict[str, np.ndarray]:
+    format = __format(file_path)
+
+    if isinstance(file_path, ArchivePath):
+        file_path = io.BytesIO(file_path.read_bytes())  # archive members are not seekable without decompressing again
+
+    match format:
+        case "npz":
+            return __read_npz(file_path, names)
+        case "parquet":
+            return __read_parquet(file_path, names)
+        case "hdf5":
+            return __read_hdf5(file_path, names)
+
+
+def read_message(file_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    columns = __read_columns(file_path)
+
+    timestamp = columns.pop("timestamp")
+
+    if "string" in columns:
+        return np.column_stack((timestamp, np.full(len(timestamp), np.nan))), columns["string"]
+
+    csv = np.empty((len(timestamp), len(columns) + 1))  # payload dtypes are promoted to float as if parsed from CSV
+
+    csv[:, 0] = timestamp
+
+    for index, column in enumerate(columns.values(), 1):
+        csv[:, index] = column
+
+    return csv, np.empty([0, 1])
+
+
+def first_and_last_timestamps(file_path: Path) -> tuple[float, float] | None:
+    timestamp = __read_columns(file_path, ["timestamp"])["timestamp"]
+
+    if len(timestamp) == 0:
+        return None
+
+    return float(timestamp[0]), float(timestamp[-1])
+
+
+def number_of_rows(file_path: Path) -> int:
+    return len(__read_columns(file_path, ["timestamp"])["timestamp"])
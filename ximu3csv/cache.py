@@ -0,0 +1,85 @@
+import json
+import os
+from functools import cache, partial
+from pathlib import Path
+from typing import IO, Any, Callable
+
+import numpy as np
+
+DIRECTORY_NAME = ".ximu3cache"
+
+
+@cache
+def version() -> str | None:
+    import importlib.metadata  # deferred as importing and scanning installed distributions is slow
+
+    try:
+        return importlib.metadata.version("ximu3csv")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def __path(file_path: Path, name: str) -> Path:
+    return file_path.parent / DIRECTORY_NAME / f"{file_path.stem}.{name}"
+
+
+def __replace(path: Path, write: Callable[[IO], None]) -> None:
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")  # write then rename so that concurrent readers never see partial files
+
+    with temporary_path.open("w" if path.suffix == ".json" else "wb") as file:
+        write(file)
+
+    os.replace(temporary_path, path)
+
+
+def __load(file_path: Path, key: dict[str, Any], key_name: str, array_names: tuple[str, ...], mmap: bool) -> tuple[np.ndarray, ...] | None:
+    try:
+        with __path(file_path, key_name).open() as file:
+            if json.load(file) != key:
+                return None
+
+        mmap_mode = "r" if mmap else None  # read-only memory maps keep data messages immutable
+
+        return tuple(np.load(__path(file_path, n), mmap_mode=mmap_mode) for n in array_names)
+    except (OSError, ValueError):
+        return None
+
+
+def __save(file_path: Path, key: dict[str, Any], key_name: str, arrays: dict[str, np.ndarray]) -> None:
+    key_path = __path(file_path, key_name)
+
+    try:
+        key_path.parent.mkdir(exist_ok=True)
+
+        key_path.unlink(missing_ok=True)  # invalidate before replacing arrays
+
+        for name, array in arrays.items():
+            __replace(__path(file_path, name), partial(np.save, arr=array))
+
+        __replace(key_path, partial(json.dump, key))
+    except OSError:
+        print(f"Unable to write cache for file {file_path}")
+
+
+def cache_key(file_path: Path) -> dict[str, Any]:
+    stat = file_path.stat()
+
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "version": version()}
+
+
+def load_cache(file_path: Path, key: dict[str, Any], mmap: bool = False) -> tuple[np.ndarray, np.ndarray] | None:
+    return __load(file_path, key, "json", ("csv.npy", "string.npy"), mmap)
+
+
+def save_cache(file_path: Path, key: dict[str, Any], csv: np.ndarray, string: np.ndarray) -> None:
+    __save(file_path, key, "json", {"csv.npy": csv, "string.npy": string})
+
+
+def load_index(file_path: Path, key: dict[str, Any]) -> np.ndarray | None:
+    index = __load(file_path, key, "index.json", ("index.npy",), False)
+
+    return None if index is None else index[0]
+
+
+def save_index(file_path: Path, key: dict[str, Any], index: np.ndarray) -> None:
+    __save(file_path, key, "index.json", {"index.npy": index})
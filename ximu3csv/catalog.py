@@ -0,0 +1,202 @@
+import os
+from datetime import datetime
+from pathlib import Path
+
+from . import binary, parse
+from .data_messages import DataMessageType
+from .read import MESSAGE_SUFFIXES, message_file_paths, read_device_info
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    directory TEXT PRIMARY KEY,
+    session TEXT NOT NULL,
+    mtime INTEGER NOT NULL,
+    interface TEXT,
+    device_name TEXT,
+    serial_number TEXT,
+    time TEXT,
+    first_timestamp REAL,
+    last_timestamp REAL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    directory TEXT NOT NULL REFERENCES devices (directory) ON DELETE CASCADE,
+    message_type TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    first_timestamp REAL,
+    last_timestamp REAL,
+    PRIMARY KEY (directory, message_type)
+);
+CREATE INDEX IF NOT EXISTS devices_session ON devices (session);
+CREATE INDEX IF NOT EXISTS devices_serial_number ON devices (serial_number);
+"""
+
+DEVICE_FILE_NAMES = {"Command.json"} | {f"{Path(t.file_name).stem}{s}" for t in DataMessageType for s in MESSAGE_SUFFIXES}
+
+
+class Catalog:
+    def __init__(self, path: Path) -> None:
+        import sqlite3  # deferred so that importing the package does not load sqlite
+
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute("PRAGMA foreign_keys = ON")
+        self.__connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.__connection.close()
+
+    @staticmethod
+    def __device_directories(path: Path) -> list[Path]:
+        directories = []
+
+        for root, names, file_names in os.walk(path):
+            names[:] = [n for n in names if not n.startswith(".")]  # skip caches
+
+            if DEVICE_FILE_NAMES.intersection(file_names):
+                directories.append(Path(root))
+
+        return directories
+
+    @staticmethod
+    def __mtime(directory: Path) -> int:
+        return max([directory.stat().st_mtime_ns] + [p.stat().st_mtime_ns for p in directory.iterdir() if p.is_file()])  # files replaced in place do not change the directory mtime
+
+    @staticmethod
+    def __message_row(directory: Path, message_type: DataMessageType, file_path: Path) -> tuple:
+        if file_path.suffix in binary.FORMATS.values():
+            timestamps = binary.first_and_last_timestamps(file_path)
+            rows = binary.number_of_rows(file_path)
+        else:
+            timestamps = parse.first_and_last_timestamps(file_path)  # head and tail only
+            rows = parse.number_of_rows(file_path)
+
+        first_timestamp, last_timestamp = timestamps if timestamps is not None else (None, None)
+
+        return str(directory), message_type.name, file_path.name, file_path.stat().st_size, rows, first_timestamp, last_timestamp
+
+    def __catalog_device(self, directory: Path, mtime: int) -> None:
+        try:
+            _, interface, device_name, serial_number, time = read_device_info(directory)
+        except (OSError, ValueError):  # a malformed Command.json should not abort the whole update
+            print(f"Unable to read {directory / 'Command.json'}")
+
+            interface, device_name, serial_number, time = None, None, None, None
+
+        messages = []
+
+        for message_type, file_path in message_file_paths(directory, tuple(DataMessageType)).items():
+            try:
+                messages.append(self.__message_row(directory, message_type, file_path))
+            except Exception as _:
+                print(f"Unable to catalog file {file_path}")
+
+        first_timestamps = [m[5] for m in messages if m[5] is not None]
+        last_timestamps = [m[6] for m in messages if m[6] is not None]
+
+        self.__connection.execute("DELETE FROM messages WHERE directory = ?", (str(directory),))
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO devices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                str(directory),
+                str(directory.parent),
+                mtime,
+                interface,
+                device_name,
+                serial_number,
+                None if time is None else time.isoformat(" "),  # ISO strings compare in chronological order
+                min(first_timestamps, default=None),
+                max(last_timestamps, default=None),
+            ),
+        )
+        self.__connection.executemany("INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, ?)", messages)
+
+    def update(self, path: Path) -> int:
+        path = Path(path)
+
+        if not path.is_absolute():
+            path = Path(__import__("__main__").__file__).parent / path
+
+        if not path.exists():
+            raise ValueError(f'"{path}" does not exist')
+
+        if not path.is_dir():
+            raise ValueError(f'"{path}" is not a directory')
+
+        mtimes = dict(self.__connection.execute("SELECT directory, mtime FROM devices"))
+
+        directories = self.__device_directories(path)
+
+        updated = 0
+
+        with self.__connection:  # one transaction so that an interrupted update leaves the catalog unchanged
+            for directory in directories:
+                mtime = self.__mtime(directory)
+
+                if mtimes.get(str(directory)) == mtime:  # unchanged since the last update
+                    continue
+
+                self.__catalog_device(directory, mtime)
+
+                updated += 1
+
+            found = {str(d) for d in directories}
+
+            removed = [(d,) for d in mtimes if d not in found and Path(d).is_relative_to(path)]
+
+            self.__connection.executemany("DELETE FROM devices WHERE directory = ?", removed)
+
+        return updated + len(removed)
+
+    def query(
+        self,
+        serial_number: str | None = None,
+        device_name: str | None = None,
+        after: datetime | None = None,
+        before: datetime | None = None,
+        min_duration: float | None = None,
+        max_duration: float | None = None,
+        message_type: DataMessageType | None = None,
+    ) -> list[Path]:
+        conditions = []
+        parameters = []
+
+        if serial_number is not None:
+            conditions.append("serial_number = ?")
+            parameters.append(serial_number)
+
+        if device_name is not None:
+            conditions.append("device_name = ?")
+            parameters.append(device_name)
+
+        if after is not None:
+            conditions.append("time >= ?")
+            parameters.append(after.isoformat(" "))
+
+        if before is not None:
+            conditions.append("time <= ?")
+            parameters.append(before.isoformat(" "))
+
+        if min_duration is not None:
+            conditions.append("last_timestamp - first_timestamp >= ?")
+            parameters.append(min_duration * 1e6)  # seconds to microseconds
+
+        if max_duration is not None:
+            conditions.append("last_timestamp - first_timestamp <= ?")
+            parameters.append(max_duration * 1e6)
+
+        if message_type is not None:
+            conditions.append("EXISTS (SELECT 1 FROM messages m WHERE m.directory = devices.directory AND m.message_type = ? AND m.rows > 0)")
+            parameters.append(message_type.name)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = self.__connection.execute(f"SELECT DISTINCT session FROM devices {where} ORDER BY session", parameters)
+
+        return [Path(s) for (s,) in rows]  # session directories that may be passed to read()
@@ -0,0 +1,124 @@
+import gzip
+import io
+import posixpath
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import IO, Iterator
+
+from .optional import import_optional
+
+SUFFIXES = (".gz", ".zst")  # compressed CSV files, e.g. Inertial.csv.gz
+
+
+@dataclass(frozen=True)
+class ArchivePath:  # member of a zip archive, picklable so that members can be parsed in worker processes
+    archive: Path
+    at: str = ""
+
+    def __str__(self) -> str:
+        return str(self.archive / self.at)
+
+    def __truediv__(self, name: str) -> "ArchivePath":
+        return ArchivePath(self.archive, posixpath.join(self.at, name))
+
+    def __zip_path(self) -> zipfile.Path:
+        root = zipfile.Path(self.archive)
+
+        return root.joinpath(*self.at.split("/")) if self.at else root  # joinpath resolves directories, which end with "/" in the archive
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.at).name or self.archive.name
+
+    @property
+    def suffix(self) -> str:
+        return PurePosixPath(self.name).suffix
+
+    @property
+    def stem(self) -> str:
+        return PurePosixPath(self.name).stem
+
+    @property
+    def parent(self) -> "ArchivePath":
+        return ArchivePath(self.archive, posixpath.dirname(self.at))
+
+    def exists(self) -> bool:
+        return self.__zip_path().exists()
+
+    def is_dir(self) -> bool:
+        return self.__zip_path().is_dir()
+
+    def is_file(self) -> bool:
+        return self.__zip_path().is_file()
+
+    def iterdir(self) -> list["ArchivePath"]:
+        return [self / p.name for p in self.__zip_path().iterdir()]
+
+    def open(self, mode: str = "r") -> IO:
+        return self.__zip_path().open(mode)
+
+    def read_bytes(self) -> bytes:
+        return self.__zip_path().read_bytes()
+
+    def size(self) -> int:
+        with zipfile.ZipFile(self.archive) as archive:
+            return archive.getinfo(self.at).compress_size
+
+
+def open_archive(file_path: Path) -> ArchivePath:
+    root = ArchivePath(file_path)
+
+    children = root.iterdir()
+
+    if len(children) == 1 and children[0].is_dir() and all(c.is_dir() for c in children[0].iterdir()):  # archive of the session directory rather than of its contents
+        return children[0]
+
+    return root
+
+
+def is_compressed(file_path: Path | ArchivePath) -> bool:
+    return file_path.suffix in SUFFIXES or isinstance(file_path, ArchivePath)
+
+
+def file_size(file_path: Path | ArchivePath) -> int:
+    if isinstance(file_path, ArchivePath):
+        return file_path.size()
+
+    return file_path.stat().st_size
+
+
+def read_bytes(file_path: Path | ArchivePath) -> bytes:
+    match file_path.suffix:
+        case ".gz":
+            return gzip.decompress(file_path.read_bytes())
+        case ".zst":
+            zstandard = import_optional("zstandard", 'Suffix ".zst"')
+
+            reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(file_path.read_bytes()), read_across_frames=True)  # files may hold several frames, e.g. appended logs
+
+            return reader.read()
+        case _:
+            return file_path.read_bytes()
+
+
+@contextmanager
+def stream(file_path: Path | ArchivePath) -> Iterator[IO[bytes]]:
+    with file_path.open("rb") as file:
+        match file_path.suffix:
+            case ".gz":
+                yield gzip.GzipFile(fileobj=file)  # decompressed as lines are read
+            case ".zst":
+                zstandard = import_optional("zstandard", 'Suffix ".zst"')
+
+                yield io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(file, read_across_frames=True))
+            case _:
+                yield file
+
+
+def open_file(file_path: Path | ArchivePath) -> IO[bytes]:
+    if is_compressed(file_path):
+        return io.BytesIO(read_bytes(file_path))  # decompressed in memory so that the file can be seeked
+
+    return file_path.open("rb")
@@ -1,42 +1,49 @@
 from dataclasses import replace
 
 import numpy as np
-import scipy
 
-from .data_messages import EulerAngles
+from .data_messages import EulerAngles, compact_message
 from .device import Device
+from .instrumentation import measure
 
 
 def __convert_to_euler_angles(device: Device) -> EulerAngles:
     if len(device.quaternion.timestamp) > 0:
-        timestamp = device.quaternion.timestamp
-        rotations = scipy.spatial.transform.Rotation.from_quat(device.quaternion.quaternion.wxyz[:, [1, 2, 3, 0]])
+        message = device.quaternion
 
     elif len(device.rotation_matrix.timestamp) > 0:
-        timestamp = device.rotation_matrix.timestamp
-        rotations = scipy.spatial.transform.Rotation.from_matrix(device.rotation_matrix.rotation_matrix.reshape(-1, 3, 3))
+        message = device.rotation_matrix
 
     elif len(device.linear_acceleration.timestamp) > 0:
-        timestamp = device.linear_acceleration.timestamp
-        rotations = scipy.spatial.transform.Rotation.from_quat(device.linear_acceleration.quaternion.wxyz[:, [1, 2, 3, 0]])
+        message = device.linear_acceleration
 
     elif len(device.earth_acceleration.timestamp) > 0:
-        timestamp = device.earth_acceleration.timestamp
-        rotations = scipy.spatial.transform.Rotation.from_quat(device.earth_acceleration.quaternion.wxyz[:, [1, 2, 3, 0]])
+        message = device.earth_acceleration
 
     else:
         return device.euler_angles
 
-    return EulerAngles(
+    euler_angles = EulerAngles(
         _csv=np.column_stack(
             (
-                timestamp,
-                rotations.as_euler("ZYX", degrees=True)[:, [2, 1, 0]],
+                message.timestamp,
+                message.as_euler_angles,  # cached by the message
             )
         ),
         _string=np.empty([0, 1]),
     )
 
+    return compact_message(euler_angles) if message._timestamp is not None else euler_angles
+
+
+def __convert_device(device: Device) -> Device:
+    with measure("convert_to_euler_angles", "EulerAngles", device.serial_number) as record:
+        euler_angles = __convert_to_euler_angles(device)
+
+        record.rows = len(euler_angles._csv)
+
+        return replace(device, euler_angles=euler_angles)
+
 
 def convert_to_euler_angles(devices: list[Device]) -> list[Device]:
-    return [replace(d, euler_angles=__convert_to_euler_angles(d)) for d in devices]
+    return [__convert_device(d) for d in devices]
@@ -1,20 +1,83 @@
 from dataclasses import replace
+from typing import Iterable, Iterator
+
+import numpy as np
 
 from .data_messages import DataMessage
 from .device import Device, update_first_and_last_timestamps
+from .instrumentation import device_label, measure
+
+NON_MONOTONIC = ("mask", "warn", "sort")
 
 
-def __crop(message: DataMessage, start: int, stop: int) -> DataMessage:
-    mask = (message.timestamp >= start) & (message.timestamp <= stop)
+def __is_monotonic(timestamp: np.ndarray) -> bool:
+    return bool(np.all(timestamp[1:] >= timestamp[:-1]))
 
+
+def __select(message: DataMessage, rows: slice | np.ndarray) -> DataMessage:
     return replace(
         message,
-        _csv=message._csv[mask],
-        _string=message._string[mask] if len(message._string) > 0 else message._string,
+        _csv=message._csv[rows],
+        _string=message._string[rows] if len(message._string) > 0 else message._string,
+        _timestamp=message._timestamp[rows] if message._timestamp is not None else None,
     )
 
 
-def crop(devices: list[Device], start: int = 0, stop: int = 2**64 - 1) -> list[Device]:
+def __window(timestamp: np.ndarray, start: int, stop: int) -> slice:
+    return slice(np.searchsorted(timestamp, start, "left"), np.searchsorted(timestamp, stop, "right"))
+
+
+def crop_message(message: DataMessage, start: int, stop: int, non_monotonic: str = "mask") -> DataMessage:
+    with measure("crop", type(message).__name__) as record:
+        timestamp = message.timestamp
+
+        if __is_monotonic(timestamp):
+            rows = __window(timestamp, start, stop)  # views of the original arrays
+        elif non_monotonic == "sort":
+            order = np.argsort(timestamp, kind="stable")
+
+            message = __select(message, order)
+
+            rows = __window(timestamp[order], start, stop)
+        else:
+            if non_monotonic == "warn":
+                print(f"{type(message).__name__} timestamps are not monotonic")
+
+            rows = (timestamp >= start) & (timestamp <= stop)
+
+        message = __select(message, rows)
+
+        record.rows = len(message._csv)
+
+        return message
+
+
+def __crop_device(device: Device, start: int, stop: int, non_monotonic: str) -> Device:
+    with device_label(device.serial_number):
+        return replace(
+            device,
+            inertial=crop_message(device.inertial, start, stop, non_monotonic),
+            magnetometer=crop_message(device.magnetometer, start, stop, non_monotonic),
+            quaternion=crop_message(device.quaternion, start, stop, non_monotonic),
+            rotation_matrix=crop_message(device.rotation_matrix, start, stop, non_monotonic),
+            euler_angles=crop_message(device.euler_angles, start, stop, non_monotonic),
+            linear_acceleration=crop_message(device.linear_acceleration, start, stop, non_monotonic),
+            earth_acceleration=crop_message(device.earth_acceleration, start, stop, non_monotonic),
+            ahrs_status=crop_message(device.ahrs_status, start, stop, non_monotonic),
+            high_g_accelerometer=crop_message(device.high_g_accelerometer, start, stop, non_monotonic),
+            temperature=crop_message(device.temperature, start, stop, non_monotonic),
+            battery=crop_message(device.battery, start, stop, non_monotonic),
+            rssi=crop_message(device.rssi, start, stop, non_monotonic),
+            serial_accessory=crop_message(device.serial_accessory, start, stop, non_monotonic),
+            notification=crop_message(device.notification, start, stop, non_monotonic),
+            error=crop_message(device.error, start, stop, non_monotonic),
+        )
+
+
+def crop(devices: list[Device], start: int = 0, stop: int = 2**64 - 1, non_monotonic: str = "mask") -> list[Device]:
+    if non_monotonic not in NON_MONOTONIC:
+        raise ValueError(f'Invalid non_monotonic "{non_monotonic}". Must be one of {NON_MONOTONIC}')
+
     first_timestamps = [d.first_timestamp for d in devices if d.first_timestamp is not None]
     last_timestamps = [d.last_timestamp for d in devices if d.last_timestamp is not None]
 
@@ -27,26 +90,25 @@ def crop(devices: list[Device], start: int = 0, stop: int = 2**64 - 1) -> list[D
     if stop < min(first_timestamps):
         raise ValueError(f"Stop {stop} is before first timestamp {min(first_timestamps)}")
 
-    devices = [
-        replace(
-            d,
-            inertial=__crop(d.inertial, start, stop),
-            magnetometer=__crop(d.magnetometer, start, stop),
-            quaternion=__crop(d.quaternion, start, stop),
-            rotation_matrix=__crop(d.rotation_matrix, start, stop),
-            euler_angles=__crop(d.euler_angles, start, stop),
-            linear_acceleration=__crop(d.linear_acceleration, start, stop),
-            earth_acceleration=__crop(d.earth_acceleration, start, stop),
-            ahrs_status=__crop(d.ahrs_status, start, stop),
-            high_g_accelerometer=__crop(d.high_g_accelerometer, start, stop),
-            temperature=__crop(d.temperature, start, stop),
-            battery=__crop(d.battery, start, stop),
-            rssi=__crop(d.rssi, start, stop),
-            serial_accessory=__crop(d.serial_accessory, start, stop),
-            notification=__crop(d.notification, start, stop),
-            error=__crop(d.error, start, stop),
-        )
-        for d in devices
-    ]
+    devices = [__crop_device(d, start, stop, non_monotonic) for d in devices]
 
     return [update_first_and_last_timestamps(d) for d in devices]
+
+
+def crop_chunks(chunks: Iterable[DataMessage], start: int = 0, stop: int = 2**64 - 1, non_monotonic: str = "mask") -> Iterator[DataMessage]:
+    if non_monotonic not in NON_MONOTONIC:
+        raise ValueError(f'Invalid non_monotonic "{non_monotonic}". Must be one of {NON_MONOTONIC}')
+
+    for chunk in chunks:
+        timestamp = chunk.timestamp  # allocated on each access when the chunk has an offset
+
+        if len(timestamp) == 0:
+            continue
+
+        if timestamp[0] > stop:
+            return  # timestamps are monotonic so no later chunk is within the window
+
+        chunk = crop_message(chunk, start, stop, non_monotonic)
+
+        if len(chunk._csv) > 0:
+            yield chunk
@@ -1,9 +1,14 @@
 from abc import ABC
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum, auto
+from functools import cached_property
+from typing import Any, ClassVar
 
 import numpy as np
 
+from . import quaternion
+from .optional import import_optional
+
 
 class DataMessageType(Enum):
     INERTIAL = auto()
@@ -63,10 +68,41 @@ class DataMessageType(Enum):
 class DataMessage(ABC):
     _csv: np.ndarray
     _string: np.ndarray
+    _timestamp: np.ndarray | None = None  # compact storage only, see compact_message()
+    _offset: float = 0  # subtracted from stored timestamps, see zero_first_timestamp()
+
+    _COMPACT_DTYPE: ClassVar[type] = np.float32
+    _COLUMNS: ClassVar[tuple[str, ...]] = ()  # names of the columns after the timestamp
+    _INTERPOLATION: ClassVar[dict[str, str]] = {}  # resample() policy of columns that are not interpolated linearly
 
     @property
     def timestamp(self) -> np.ndarray:
-        return self._csv[:, 0]
+        timestamp = self._timestamp if self._timestamp is not None else self._csv[:, 0]
+
+        if self._offset:
+            return timestamp - self._offset
+
+        return timestamp
+
+    def _payload(self) -> tuple[tuple[str, ...], np.ndarray]:
+        return self._COLUMNS, self._csv[:, 1 : len(self._COLUMNS) + 1]
+
+    def _columns(self) -> dict[str, np.ndarray]:
+        names, payload = self._payload()
+
+        return {"timestamp": self.timestamp, **dict(zip(names, payload.T))}
+
+    def to_dataframe(self) -> Any:
+        pandas = import_optional("pandas", "to_dataframe()")
+
+        names, payload = self._payload()
+
+        return pandas.DataFrame(payload, index=pandas.Index(self.timestamp, name="timestamp"), columns=list(names), copy=False)  # payload is not copied
+
+    def to_arrow(self) -> Any:
+        pyarrow = import_optional("pyarrow", "to_arrow()")
+
+        return pyarrow.table({n: pyarrow.array(c) for n, c in self._columns().items()})
 
 
 @dataclass(frozen=True)
@@ -117,8 +153,33 @@ class Wxyz:
         return self.__csv[:, self.__column + 3]
 
 
+@dataclass(frozen=True)
+class OrientationMessage(DataMessage):  # derived representations are computed once per message, replace() creates a new message
+    @cached_property
+    def as_quaternion(self) -> np.ndarray:
+        wxyz = self._csv[:, 1:5]
+
+        return wxyz / np.linalg.norm(wxyz, axis=1, keepdims=True)
+
+    @cached_property
+    def as_rotation_matrix(self) -> np.ndarray:
+        return quaternion.to_rotation_matrix(self.as_quaternion)
+
+    @cached_property
+    def as_euler_angles(self) -> np.ndarray:
+        return quaternion.to_euler_angles(self.as_quaternion)
+
+    @cached_property
+    def as_rotation(self) -> Any:
+        transform = import_optional("scipy.spatial.transform", "as_rotation")
+
+        return transform.Rotation.from_quat(self.as_quaternion[:, [1, 2, 3, 0]])
+
+
 @dataclass(frozen=True)
 class Inertial(DataMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("gyroscope_x", "gyroscope_y", "gyroscope_z", "accelerometer_x", "accelerometer_y", "accelerometer_z")
+
     @property
     def gyroscope(self) -> Xyz:
         return Xyz(self._csv, 1)
@@ -130,24 +191,40 @@ class Inertial(DataMessage):
 
 @dataclass(frozen=True)
 class Magnetometer(DataMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("magnetometer_x", "magnetometer_y", "magnetometer_z")
+
     @property
     def magnetometer(self) -> Xyz:
         return Xyz(self._csv, 1)
 
 
 @dataclass(frozen=True)
-class Quaternion(DataMessage):
+class Quaternion(OrientationMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("quaternion_w", "quaternion_x", "quaternion_y", "quaternion_z")
+    _INTERPOLATION: ClassVar[dict[str, str]] = dict.fromkeys(_COLUMNS, "slerp")
+
     @property
     def quaternion(self) -> Wxyz:
         return Wxyz(self._csv, 1)
 
 
 @dataclass(frozen=True)
-class RotationMatrix(DataMessage):
+class RotationMatrix(OrientationMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("xx", "xy", "xz", "yx", "yy", "yz", "zx", "zy", "zz")
+    _INTERPOLATION: ClassVar[dict[str, str]] = dict.fromkeys(_COLUMNS, "slerp")
+
     @property
     def rotation_matrix(self) -> np.ndarray:
         return self._csv[:, 1:10]
 
+    @cached_property
+    def as_quaternion(self) -> np.ndarray:
+        return quaternion.from_rotation_matrix(self._csv[:, 1:10])
+
+    @cached_property
+    def as_rotation_matrix(self) -> np.ndarray:
+        return self._csv[:, 1:10]
+
     @property
     def xx(self) -> np.ndarray:
         return self._csv[:, 1]
@@ -186,11 +263,22 @@ class RotationMatrix(DataMessage):
 
 
 @dataclass(frozen=True)
-class EulerAngles(DataMessage):
+class EulerAngles(OrientationMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("roll", "pitch", "yaw")
+    _INTERPOLATION: ClassVar[dict[str, str]] = dict.fromkeys(_COLUMNS, "slerp")
+
     @property
     def euler_angles(self) -> np.ndarray:
         return self._csv[:, 1:4]
 
+    @cached_property
+    def as_quaternion(self) -> np.ndarray:
+        return quaternion.from_euler_angles(self._csv[:, 1:4])
+
+    @cached_property
+    def as_euler_angles(self) -> np.ndarray:
+        return self._csv[:, 1:4]
+
     @property
     def roll(self) -> np.ndarray:
         return self._csv[:, 1]
@@ -205,7 +293,18 @@ class EulerAngles(DataMessage):
 
 
 @dataclass(frozen=True)
-class LinearAcceleration(DataMessage):
+class LinearAcceleration(OrientationMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = (
+        "quaternion_w",
+        "quaternion_x",
+        "quaternion_y",
+        "quaternion_z",
+        "linear_acceleration_x",
+        "linear_acceleration_y",
+        "linear_acceleration_z",
+    )
+    _INTERPOLATION: ClassVar[dict[str, str]] = dict.fromkeys(_COLUMNS[:4], "slerp")
+
     @property
     def quaternion(self) -> Wxyz:
         return Wxyz(self._csv, 1)
@@ -216,7 +315,18 @@ class LinearAcceleration(DataMessage):
 
 
 @dataclass(frozen=True)
-class EarthAcceleration(DataMessage):
+class EarthAcceleration(OrientationMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = (
+        "quaternion_w",
+        "quaternion_x",
+        "quaternion_y",
+        "quaternion_z",
+        "earth_acceleration_x",
+        "earth_acceleration_y",
+        "earth_acceleration_z",
+    )
+    _INTERPOLATION: ClassVar[dict[str, str]] = dict.fromkeys(_COLUMNS[:4], "slerp")
+
     @property
     def quaternion(self) -> Wxyz:
         return Wxyz(self._csv, 1)
@@ -228,6 +338,10 @@ class EarthAcceleration(DataMessage):
 
 @dataclass(frozen=True)
 class AhrsStatus(DataMessage):
+    _COMPACT_DTYPE: ClassVar[type] = np.uint8
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("initialising", "angular_rate_recovery", "acceleration_rate_recovery", "magnetic_rate_recovery")
+    _INTERPOLATION: ClassVar[dict[str, str]] = dict.fromkeys(_COLUMNS, "previous")  # flags are held until the next sample
+
     @property
     def initialising(self) -> np.ndarray:
         return self._csv[:, 1]
@@ -247,6 +361,8 @@ class AhrsStatus(DataMessage):
 
 @dataclass(frozen=True)
 class HighGAccelerometer(DataMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("high_g_accelerometer_x", "high_g_accelerometer_y", "high_g_accelerometer_z")
+
     @property
     def high_g_accelerometer(self) -> Xyz:
         return Xyz(self._csv, 1)
@@ -254,6 +370,8 @@ class HighGAccelerometer(DataMessage):
 
 @dataclass(frozen=True)
 class Temperature(DataMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("temperature",)
+
     @property
     def temperature(self) -> np.ndarray:
         return self._csv[:, 1]
@@ -261,6 +379,9 @@ class Temperature(DataMessage):
 
 @dataclass(frozen=True)
 class Battery(DataMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("percentage", "voltage", "charging_status")
+    _INTERPOLATION: ClassVar[dict[str, str]] = {"charging_status": "previous"}
+
     @property
     def percentage(self) -> np.ndarray:
         return self._csv[:, 1]
@@ -276,6 +397,8 @@ class Battery(DataMessage):
 
 @dataclass(frozen=True)
 class Rssi(DataMessage):
+    _COLUMNS: ClassVar[tuple[str, ...]] = ("percentage", "power")
+
     @property
     def percentage(self) -> np.ndarray:
         return self._csv[:, 1]
@@ -287,6 +410,9 @@ class Rssi(DataMessage):
 
 @dataclass(frozen=True)
 class SerialAccessory(DataMessage):
+    def _payload(self) -> tuple[tuple[str, ...], np.ndarray]:
+        return tuple(f"csv_{i}" for i in range(1, self._csv.shape[1])), self._csv[:, 1:]  # number of columns depends on the accessory
+
     @property
     def csv(self) -> np.ndarray:
         return self._csv[:, 1:]
@@ -294,6 +420,9 @@ class SerialAccessory(DataMessage):
 
 @dataclass(frozen=True)
 class Notification(DataMessage):
+    def _payload(self) -> tuple[tuple[str, ...], np.ndarray]:
+        return ("string",), np.asarray(self._string, dtype=str).reshape(-1, 1)
+
     @property
     def string(self) -> np.ndarray:
         return self._string
@@ -301,6 +430,54 @@ class Notification(DataMessage):
 
 @dataclass(frozen=True)
 class Error(DataMessage):
+    def _payload(self) -> tuple[tuple[str, ...], np.ndarray]:
+        return ("string",), np.asarray(self._string, dtype=str).reshape(-1, 1)
+
     @property
     def string(self) -> np.ndarray:
         return self._string
+
+
+MESSAGE_CLASSES = {
+    DataMessageType.INERTIAL: Inertial,
+    DataMessageType.MAGNETOMETER: Magnetometer,
+    DataMessageType.QUATERNION: Quaternion,
+    DataMessageType.ROTATION_MATRIX: RotationMatrix,
+    DataMessageType.EULER_ANGLES: EulerAngles,
+    DataMessageType.LINEAR_ACCELERATION: LinearAcceleration,
+    DataMessageType.EARTH_ACCELERATION: EarthAcceleration,
+    DataMessageType.AHRS_STATUS: AhrsStatus,
+    DataMessageType.HIGH_G_ACCELEROMETER: HighGAccelerometer,
+    DataMessageType.TEMPERATURE: Temperature,
+    DataMessageType.BATTERY: Battery,
+    DataMessageType.RSSI: Rssi,
+    DataMessageType.SERIAL_ACCESSORY: SerialAccessory,
+    DataMessageType.NOTIFICATION: Notification,
+    DataMessageType.ERROR: Error,
+}
+
+
+def compact_message(message: DataMessage) -> DataMessage:
+    if message._timestamp is not None:
+        return message
+
+    csv = message._csv.astype(message._COMPACT_DTYPE)
+    csv[:, 0] = 0  # timestamps are stored separately as uint64, the unused column is kept so that payload columns have the same indices as uncompacted messages
+
+    return replace(message, _csv=csv, _timestamp=message.timestamp.astype(np.uint64), _offset=0)
+
+
+def __is_compactable(message: DataMessage, csv: np.ndarray) -> bool:
+    timestamp = csv[:, 0]
+
+    if np.any(timestamp < 0) or np.any(timestamp != np.floor(timestamp)):  # uint64 timestamps would wrap or be truncated
+        return False
+
+    return not np.issubdtype(message._COMPACT_DTYPE, np.integer) or not np.isnan(csv).any()  # NaN would be cast to 0
+
+
+def replace_csv(message: DataMessage, csv: np.ndarray) -> DataMessage:
+    if message._timestamp is None or not __is_compactable(message, csv):
+        return replace(message, _csv=csv, _timestamp=None, _offset=0)  # csv timestamps already include the offset
+
+    return compact_message(replace(message, _csv=csv, _timestamp=None, _offset=0))  # keep compact storage
@@ -0,0 +1,15 @@
+from typing import Any
+
+from .data_messages import DataMessageType
+from .device import Device
+from .optional import import_optional
+
+
+def to_dataframe(devices: list[Device], message_type: DataMessageType) -> Any:
+    pandas = import_optional("pandas", "to_dataframe()")
+
+    frames = [getattr(d, message_type.name.lower()).to_dataframe() for d in devices]
+
+    keys = [d.serial_number if d.serial_number is not None else str(i) for i, d in enumerate(devices)]
+
+    return pandas.concat(frames, keys=keys, names=["serial_number"]).reset_index()  # long format, one row per device and timestamp
@@ -1,11 +1,12 @@
 from dataclasses import dataclass, fields, replace
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 
 from .data_messages import (
     AhrsStatus,
     Battery,
     DataMessage,
+    DataMessageType,
     EarthAcceleration,
     Error,
     EulerAngles,
@@ -56,6 +57,11 @@ class Device:
     first_timestamp: int | None
     last_timestamp: int | None
 
+    def to_frames(self) -> dict[str, Any]:
+        messages = {t.name.lower(): getattr(self, t.name.lower()) for t in DataMessageType}
+
+        return {n: m.to_dataframe() for n, m in messages.items() if len(m._csv) > 0}  # keyed by attribute name
+
 
 def update_first_and_last_timestamps(device: Device) -> Device:
     device = replace(device, first_timestamp=None)
@@ -67,13 +73,40 @@ def update_first_and_last_timestamps(device: Device) -> Device:
         if not isinstance(attribute, DataMessage):
             continue
 
-        if len(attribute.timestamp) == 0:
+        timestamp = attribute.timestamp
+
+        if len(timestamp) == 0:
             continue
 
-        if device.first_timestamp is None or attribute.timestamp[0] < device.first_timestamp:
-            device = replace(device, first_timestamp=attribute.timestamp[0])
+        if device.first_timestamp is None or timestamp[0] < device.first_timestamp:
+            device = replace(device, first_timestamp=timestamp[0])
 
-        if device.last_timestamp is None or attribute.timestamp[-1] > device.last_timestamp:
-            device = replace(device, last_timestamp=attribute.timestamp[-1])
+        if device.last_timestamp is None or timestamp[-1] > device.last_timestamp:
+            device = replace(device, last_timestamp=timestamp[-1])
 
     return device
+
+
+class LazyDevice(Device):
+    def __getattr__(self, name: str) -> Any:  # only called for data messages that have not been loaded
+        loaders = self.__dict__.get("_loaders", {})
+
+        if name not in loaders:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        message = loaders.pop(name)()
+
+        object.__setattr__(self, name, message)
+
+        return message
+
+
+def lazy_device(device: dict[str, Any], loaders: dict[str, Callable[[], DataMessage]]) -> LazyDevice:
+    lazy_device = object.__new__(LazyDevice)
+
+    for name, value in device.items():
+        object.__setattr__(lazy_device, name, value)
+
+    object.__setattr__(lazy_device, "_loaders", loaders)
+
+    return lazy_device
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import numpy as np
+
+from .cache import cache_key, load_index, save_index
+
+STRIDE = 1024  # rows between index entries
+
+BLOCK_SIZE = 2**24  # bytes scanned per read when building an index
+
+
+def build_index(file_path: Path) -> np.ndarray:
+    with file_path.open("rb") as file:
+        header_size = len(file.readline())
+
+        offsets = [np.array([header_size])]  # first row
+        row = 0
+        block_start = header_size
+
+        while block := file.read(BLOCK_SIZE):
+            line_starts = block_start + np.flatnonzero(np.frombuffer(block, np.uint8) == ord("\n")) + 1  # rows row + 1, row + 2, ...
+
+            offsets.append(line_starts[-(row + 1) % STRIDE :: STRIDE])
+
+            row += len(line_starts)
+            block_start += len(block)
+
+        index = []
+
+        for offset in np.concatenate(offsets):
+            file.seek(offset)
+
+            if line := file.readline().strip():  # skip blank lines and end of file
+                index.append((float(line.split(b",", 1)[0]), offset))
+
+    return np.array(index, dtype=float).reshape(-1, 2)  # [timestamp, byte offset] of every STRIDE-th row
+
+
+def get_index(file_path: Path, cache: bool) -> np.ndarray:
+    if cache:
+        key = cache_key(file_path)
+
+        if (index := load_index(file_path, key)) is not None:
+            return index
+
+    index = build_index(file_path)
+
+    if cache:
+        save_index(file_path, key, index)
+
+    return index
+
+
+def is_monotonic(index: np.ndarray) -> bool:
+    return bool(np.all(np.diff(index[:, 0]) >= 0))  # read_window() searches the index so requires sorted timestamps
+
+
+def read_window(file_path: Path, index: np.ndarray, start: int, stop: int) -> tuple[bytes, bytes]:
+    timestamps = index[:, 0]
+    offsets = index[:, 1].astype(np.int64)
+
+    with file_path.open("rb") as file:
+        header = file.readline()
+
+        if len(offsets) == 0:
+            return header, b""
+
+        first = max(np.searchsorted(timestamps, start, "left") - 1, 0)  # rows before this entry are before start
+        last = np.searchsorted(timestamps, stop, "right")  # rows from this entry are after stop
+
+        file.seek(offsets[first])
+
+        if last < len(offsets):
+            return header, file.read(offsets[last] - offsets[first])
+
+        return header, file.read()
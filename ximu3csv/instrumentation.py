@@ -0,0 +1,118 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+
+
+@dataclass
+class Record:
+    stage: str
+    device: str | None
+    message: str | None
+    seconds: float = 0
+    rows: int = 0
+    bytes: int = 0  # bytes read from files
+    allocated: int = 0  # net bytes allocated, only recorded while tracemalloc is tracing
+
+
+class Profile:
+    def __init__(self) -> None:
+        self.records: list[Record] = []
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        summary = {}
+
+        for record in self.records:
+            stage = summary.setdefault(record.stage, {"calls": 0, "seconds": 0.0, "rows": 0, "bytes": 0, "allocated": 0})
+
+            stage["calls"] += 1
+            stage["seconds"] += record.seconds
+            stage["rows"] += record.rows
+            stage["bytes"] += record.bytes
+            stage["allocated"] += record.allocated
+
+        return summary
+
+    def table(self) -> str:
+        lines = [f"{'Stage':<24} {'Calls':>8} {'Seconds':>10} {'Rows':>14} {'Bytes':>14} {'Allocated':>14}"]
+
+        for stage, s in self.summary().items():
+            lines.append(f"{stage:<24} {s['calls']:>8} {s['seconds']:>10.3f} {s['rows']:>14,} {s['bytes']:>14,} {s['allocated']:>14,}")
+
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps([asdict(r) for r in self.records], indent=4)
+
+
+__profiles: list[Profile] = []
+
+__device: ContextVar[str | None] = ContextVar("device", default=None)
+
+
+@contextmanager
+def profile(trace_allocations: bool = False) -> Iterator[Profile]:
+    profile = Profile()
+
+    start_tracing = trace_allocations and not tracemalloc.is_tracing()
+
+    if start_tracing:
+        tracemalloc.start()
+
+    __profiles.append(profile)
+
+    try:
+        yield profile
+    finally:
+        __profiles.remove(profile)
+
+        if start_tracing:
+            tracemalloc.stop()
+
+
+@contextmanager
+def device_label(label: str | None) -> Iterator[None]:
+    if not __profiles:
+        yield
+        return
+
+    token = __device.set(label)
+
+    try:
+        yield
+    finally:
+        __device.reset(token)
+
+
+def add_records(records: list[Record]) -> None:  # records measured in worker processes
+    for p in __profiles:
+        p.records.extend(records)
+
+
+@contextmanager
+def measure(stage: str, message: str | None = None, device: str | None = None) -> Iterator[Record]:
+    record = Record(stage, device if device is not None else __device.get(), message)  # callers may set rows and bytes
+
+    if not __profiles:  # instrumentation is opt-in so nothing is measured
+        yield record
+        return
+
+    tracing = tracemalloc.is_tracing()
+
+    allocated = tracemalloc.get_traced_memory()[0] if tracing else 0
+
+    start = time.perf_counter()
+
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - start
+
+        if tracing:
+            record.allocated = tracemalloc.get_traced_memory()[0] - allocated
+
+        for p in __profiles:
+            p.records.append(record)
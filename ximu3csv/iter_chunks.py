@@ -0,0 +1,40 @@
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from .compression import SUFFIXES, stream
+from .data_messages import MESSAGE_CLASSES, DataMessage, DataMessageType
+from .parse import ENGINES, number_of_columns, parse_csv, parse_text
+
+
+def iter_chunks(path: Path, message_type: DataMessageType, chunk_rows: int = 100_000, engine: str = "fast") -> Iterator[DataMessage]:
+    path = Path(path)
+
+    if not path.is_absolute():
+        path = Path(__import__("__main__").__file__).parent / path
+
+    file_paths = [path / f"{message_type.file_name}{s}" for s in ("", *SUFFIXES)]  # compressed files are decompressed as they are read
+
+    file_path = next((p for p in file_paths if p.is_file()), file_paths[0])
+
+    if not file_path.is_file():
+        raise ValueError(f'"{file_path}" does not exist')
+
+    if chunk_rows < 1:
+        raise ValueError(f"Chunk rows {chunk_rows} must be greater than 0")
+
+    if engine not in ENGINES:
+        raise ValueError(f'Invalid engine "{engine}". Must be one of {ENGINES}')
+
+    with stream(file_path) as file:
+        columns = number_of_columns(file.readline())
+
+        while lines := list(islice(file, chunk_rows)):
+            data = b"".join(lines)
+
+            if message_type in (DataMessageType.NOTIFICATION, DataMessageType.ERROR):
+                yield MESSAGE_CLASSES[message_type](*parse_text(data))
+            else:
+                yield MESSAGE_CLASSES[message_type](parse_csv(data, columns, engine), np.empty([0, 1]))
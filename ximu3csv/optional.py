@@ -0,0 +1,9 @@
+import importlib
+from types import ModuleType
+
+
+def import_optional(name: str, feature: str) -> ModuleType:
+    try:
+        return importlib.import_module(name)
+    except ImportError as error:
+        raise ImportError(f"{feature} requires {name.split('.')[0]}") from error
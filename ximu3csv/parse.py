@@ -0,0 +1,123 @@
+import io
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .compression import open_file, stream
+
+ENGINES = ("fast", "genfromtxt")
+
+CHUNK_SIZE = 2**24  # bytes parsed per np.loadtxt call by the fast engine
+
+
+def split_header(data: bytes) -> tuple[bytes, bytes]:
+    index = data.find(b"\n")
+
+    if index == -1:
+        return data, b""
+
+    return data[: index + 1], data[index + 1 :]
+
+
+def number_of_columns(header: bytes) -> int:
+    return header.count(b",") + 1
+
+
+def __parse_genfromtxt(data: bytes, columns: int) -> np.ndarray:
+    if not data.strip():
+        return np.empty([0, columns])
+
+    return np.genfromtxt(io.BytesIO(data), delimiter=",", ndmin=2)
+
+
+def __parse_fast(data: bytes, columns: int) -> np.ndarray:
+    csv = np.empty([data.count(b"\n") + (not data.endswith(b"\n")), columns])  # preallocate one row per line
+
+    row = 0
+    start = 0
+
+    while start < len(data):
+        stop = data.find(b"\n", start + CHUNK_SIZE) + 1 or len(data)
+
+        chunk = np.loadtxt(io.BytesIO(data[start:stop]), delimiter=",", ndmin=2)
+
+        if chunk.size > 0:
+            csv[row : row + len(chunk)] = chunk  # raises ValueError if the number of columns does not match the header
+
+        row += len(chunk)
+        start = stop
+
+    return csv[:row]  # blank lines are skipped
+
+
+def parse_csv(data: bytes, columns: int, engine: str = "fast") -> np.ndarray:
+    if engine not in ENGINES:
+        raise ValueError(f'Invalid engine "{engine}". Must be one of {ENGINES}')
+
+    if engine == "fast":
+        try:
+            return __parse_fast(data, columns)
+        except ValueError:
+            pass  # fall back to np.genfromtxt for malformed files, e.g. missing values
+
+    return __parse_genfromtxt(data, columns)
+
+
+def parse_text(data: bytes) -> tuple[np.ndarray, np.ndarray]:
+    lines = [l for l in data.decode().splitlines() if l]
+
+    if not lines:
+        return np.empty([0, 2]), np.empty([0, 1])
+
+    timestamps, _, strings = zip(*(l.partition(",") for l in lines))  # split on the first comma only so strings may contain commas
+
+    csv = np.full([len(lines), 2], np.nan)
+
+    csv[:, 0] = np.array(timestamps, dtype=float)
+
+    return csv, np.array(strings)
+
+
+def first_and_last_timestamps(file_path: Path) -> tuple[float, float] | None:
+    with open_file(file_path) as file:
+        file.readline()  # header
+
+        first_line = file.readline()
+
+        if not first_line.strip():
+            return None
+
+        size = file.seek(0, os.SEEK_END)
+        block_size = 4096
+
+        while True:
+            start = max(size - block_size, 0)
+
+            file.seek(start)
+
+            lines = [l for l in file.read().splitlines() if l.strip()]
+
+            if len(lines) > 1 or start == 0:  # the first line of a block may be incomplete
+                break
+
+            block_size *= 2
+
+    try:
+        return float(first_line.split(b",", 1)[0]), float(lines[-1].split(b",", 1)[0])
+    except ValueError:
+        return None
+
+
+def number_of_rows(file_path: Path) -> int:
+    with stream(file_path) as file:
+        file.readline()  # header
+
+        rows = 0
+        last = b"\n"
+
+        while block := file.read(CHUNK_SIZE):  # lines are counted without parsing
+            rows += block.count(b"\n")
+            last = block[-1:]
+
+    return rows + (last != b"\n")  # last line may not be terminated
@@ -0,0 +1,221 @@
+from dataclasses import dataclass, replace
+from typing import Any
+
+import numpy as np
+
+from .convert_to_euler_angles import convert_to_euler_angles
+from .crop import NON_MONOTONIC, crop_message
+from .data_messages import DataMessage, DataMessageType
+from .device import Device, update_first_and_last_timestamps
+from .instrumentation import device_label
+from .resample import resample_message, validate_interpolation
+from .zero_first_timestamp import zero_first_timestamp_message
+from .zero_heading import zero_heading
+
+MESSAGE_NAMES = tuple(t.name.lower() for t in DataMessageType)
+
+EVENT_NAMES = (DataMessageType.NOTIFICATION.name.lower(), DataMessageType.ERROR.name.lower())
+
+
+@dataclass
+class _View:
+    message: DataMessage  # rows within the crop window, a slice of the original arrays where timestamps are monotonic
+    shift: float = 0  # subtracted from message timestamps
+    timestamp: np.ndarray | None = None  # resampled timestamps, message timestamps minus shift
+    intervals: list | None = None  # shared by all messages resampled to the same timestamps
+    interpolation: dict[str, str] | None = None
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        if self.timestamp is not None:
+            return self.timestamp
+
+        return self.message.timestamp
+
+    @property
+    def first_and_last(self) -> tuple[Any, Any] | None:
+        timestamps = self.timestamps
+
+        if len(timestamps) == 0:
+            return None
+
+        if self.timestamp is not None:
+            return timestamps[0], timestamps[-1]
+
+        return timestamps[0].item() - self.shift, timestamps[-1].item() - self.shift  # Python scalars as uint64 arithmetic overflows for negative shifts
+
+
+class Pipeline:
+    def __init__(self) -> None:
+        self.__steps: list[tuple[str, tuple]] = []
+
+    def crop(self, start: int = 0, stop: int = 2**64 - 1, non_monotonic: str = "mask") -> "Pipeline":
+        if non_monotonic not in NON_MONOTONIC:
+            raise ValueError(f'Invalid non_monotonic "{non_monotonic}". Must be one of {NON_MONOTONIC}')
+
+        self.__steps.append(("crop", (start, stop, non_monotonic)))
+
+        return self
+
+    def zero_first_timestamp(self, offset: int = 0) -> "Pipeline":
+        self.__steps.append(("zero_first_timestamp", (offset,)))
+
+        return self
+
+    def resample(self, sample_rate: float, interpolation: dict[str, str] | None = None) -> "Pipeline":
+        validate_interpolation(interpolation)
+
+        self.__steps.append(("resample", (sample_rate, interpolation)))
+
+        return self
+
+    def zero_heading(self, timestamp: int = 0, offset: float = 0) -> "Pipeline":
+        self.__steps.append(("zero_heading", (timestamp, offset)))
+
+        return self
+
+    def convert_to_euler_angles(self) -> "Pipeline":
+        self.__steps.append(("convert_to_euler_angles", ()))
+
+        return self
+
+    def run(self, devices: list[Device]) -> list[Device]:
+        views = None  # crop, zero_first_timestamp and resample are deferred until the messages are materialised
+
+        for name, arguments in self.__steps:
+            if name in ("zero_heading", "convert_to_euler_angles"):
+                if views is not None:
+                    devices = self.__materialise(devices, views)
+                    views = None
+
+                if name == "zero_heading":
+                    devices = zero_heading(devices, *arguments)
+                else:
+                    devices = convert_to_euler_angles(devices)
+
+                continue
+
+            if views is None:
+                views = [{n: _View(getattr(d, n)) for n in MESSAGE_NAMES} for d in devices]
+
+            if name == "crop":
+                self.__crop(devices, views, *arguments)
+            elif name == "zero_first_timestamp":
+                self.__zero_first_timestamp(views, *arguments)
+            else:
+                self.__resample(devices, views, *arguments)
+
+        if views is not None:
+            devices = self.__materialise(devices, views)
+
+        return devices
+
+    @staticmethod
+    def __first_and_last_timestamps(views: list[dict[str, _View]]) -> tuple[list, list]:
+        first_timestamps = []
+        last_timestamps = []
+
+        for device_views in views:
+            first_and_last = [f for v in device_views.values() if (f := v.first_and_last) is not None]
+
+            if first_and_last:
+                first_timestamps.append(min(f for f, _ in first_and_last))
+                last_timestamps.append(max(l for _, l in first_and_last))
+
+        return first_timestamps, last_timestamps
+
+    @staticmethod
+    def __crop_view(view: _View, start: int, stop: int, non_monotonic: str) -> None:
+        if view.timestamp is not None:
+            view.timestamp = view.timestamp[(view.timestamp >= start) & (view.timestamp <= stop)]
+            return
+
+        view.message = crop_message(view.message, start + view.shift, stop + view.shift, non_monotonic)  # zero-copy for monotonic timestamps
+
+    def __crop(self, devices: list[Device], views: list[dict[str, _View]], start: int, stop: int, non_monotonic: str) -> None:
+        first_timestamps, last_timestamps = self.__first_and_last_timestamps(views)
+
+        if not first_timestamps:
+            return
+
+        if start > max(last_timestamps):
+            raise ValueError(f"Start {start} is after last timestamp {max(last_timestamps)}")
+
+        if stop < min(first_timestamps):
+            raise ValueError(f"Stop {stop} is before first timestamp {min(first_timestamps)}")
+
+        for device, device_views in zip(devices, views):
+            with device_label(device.serial_number):
+                for name in MESSAGE_NAMES:
+                    view = device_views[name]
+
+                    if view.timestamp is not None and name in EVENT_NAMES:  # events are moved to the ends of the resampled timestamps before they are cropped
+                        view = _View(self.__materialise_view(view))
+
+                        device_views[name] = view
+
+                    self.__crop_view(view, start, stop, non_monotonic)
+
+    def __zero_first_timestamp(self, views: list[dict[str, _View]], offset: int) -> None:
+        first_timestamps, _ = self.__first_and_last_timestamps(views)
+
+        if not first_timestamps:
+            return
+
+        first_timestamp = min(first_timestamps) - offset
+
+        for device_views in views:
+            for view in device_views.values():
+                view.shift = view.shift + first_timestamp  # folded into crop bounds and resampled timestamps
+
+                if view.timestamp is not None:
+                    view.timestamp = view.timestamp - first_timestamp
+
+    def __resample(self, devices: list[Device], views: list[dict[str, _View]], sample_rate: float, interpolation: dict[str, str] | None) -> None:
+        first_timestamps, last_timestamps = self.__first_and_last_timestamps(views)
+
+        if not first_timestamps:
+            return
+
+        if first_timestamps == last_timestamps:
+            return
+
+        timestamp = np.arange(max(first_timestamps), min(last_timestamps), 1e6 / sample_rate)
+
+        intervals = {}
+
+        for device, device_views in zip(devices, views):
+            for name in MESSAGE_NAMES:
+                view = device_views[name]
+
+                if len(view.timestamps) == 0:
+                    continue
+
+                if view.timestamp is not None:  # already resampled
+                    with device_label(device.serial_number):
+                        view = _View(self.__materialise_view(view))
+
+                    device_views[name] = view
+
+                view.timestamp = timestamp
+                view.intervals = intervals.setdefault(view.shift, [])  # intervals depend on the message timestamps after shift
+                view.interpolation = interpolation
+
+    @staticmethod
+    def __materialise_view(view: _View) -> DataMessage:
+        message = view.message
+
+        if view.timestamp is not None:
+            return resample_message(message, view.timestamp, view.intervals, view.shift, view.interpolation)
+
+        if view.shift == 0:
+            return message
+
+        return zero_first_timestamp_message(message, view.shift)
+
+    def __materialise_device(self, device: Device, device_views: dict[str, _View]) -> Device:
+        with device_label(device.serial_number):
+            return update_first_and_last_timestamps(replace(device, **{n: self.__materialise_view(v) for n, v in device_views.items()}))
+
+    def __materialise(self, devices: list[Device], views: list[dict[str, _View]]) -> list[Device]:
+        return [self.__materialise_device(d, v) for d, v in zip(devices, views)]
@@ -0,0 +1,69 @@
+import numpy as np
+
+
+def from_euler_angles(euler_angles: np.ndarray) -> np.ndarray:
+    roll, pitch, yaw = np.radians(euler_angles).T / 2
+
+    cos_roll, sin_roll = np.cos(roll), np.sin(roll)
+    cos_pitch, sin_pitch = np.cos(pitch), np.sin(pitch)
+    cos_yaw, sin_yaw = np.cos(yaw), np.sin(yaw)
+
+    return np.column_stack(
+        (
+            cos_roll * cos_pitch * cos_yaw + sin_roll * sin_pitch * sin_yaw,
+            sin_roll * cos_pitch * cos_yaw - cos_roll * sin_pitch * sin_yaw,
+            cos_roll * sin_pitch * cos_yaw + sin_roll * cos_pitch * sin_yaw,
+            cos_roll * cos_pitch * sin_yaw - sin_roll * sin_pitch * cos_yaw,
+        )
+    )
+
+
+def to_euler_angles(quaternion: np.ndarray) -> np.ndarray:
+    w, x, y, z = quaternion.T
+
+    return np.degrees(
+        np.column_stack(
+            (
+                np.arctan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y)),
+                np.arcsin(np.clip(2 * (w * y - z * x), -1, 1)),
+                np.arctan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z)),
+            )
+        )
+    )
+
+
+def from_rotation_matrix(rotation_matrix: np.ndarray) -> np.ndarray:
+    xx, xy, xz, yx, yy, yz, zx, zy, zz = rotation_matrix.T
+
+    candidates = np.stack(  # each candidate is proportional to the quaternion, the best conditioned is selected for each sample
+        (
+            (1 + xx + yy + zz, zy - yz, xz - zx, yx - xy),
+            (zy - yz, 1 + xx - yy - zz, xy + yx, xz + zx),
+            (xz - zx, xy + yx, 1 - xx + yy - zz, yz + zy),
+            (yx - xy, xz + zx, yz + zy, 1 - xx - yy + zz),
+        )
+    )  # shape [candidate, component, sample]
+
+    index = np.argmax(np.stack((xx + yy + zz, xx, yy, zz)), axis=0)
+
+    quaternion = candidates[index, :, np.arange(len(index))]
+
+    return quaternion / np.linalg.norm(quaternion, axis=1, keepdims=True)
+
+
+def to_rotation_matrix(quaternion: np.ndarray) -> np.ndarray:
+    w, x, y, z = quaternion.T
+
+    return np.column_stack(
+        (
+            1 - 2 * (y * y + z * z),
+            2 * (x * y - w * z),
+            2 * (x * z + w * y),
+            2 * (x * y + w * z),
+            1 - 2 * (x * x + z * z),
+            2 * (y * z - w * x),
+            2 * (x * z - w * y),
+            2 * (y * z + w * x),
+            1 - 2 * (x * x + y * y),
+        )
+    )
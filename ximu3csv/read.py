@@ -1,13 +1,19 @@
 import json
+from dataclasses import replace
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
 
+from . import binary, compression
+from .cache import cache_key, load_cache, save_cache
 from .data_messages import (
+    MESSAGE_CLASSES,
     AhrsStatus,
     Battery,
+    DataMessage,
     DataMessageType,
     EarthAcceleration,
     Error,
@@ -22,8 +28,14 @@ from .data_messages import (
     Rssi,
     SerialAccessory,
     Temperature,
+    compact_message,
 )
-from .device import Device, update_first_and_last_timestamps
+from .device import Device, lazy_device, update_first_and_last_timestamps
+from .index import get_index, is_monotonic, read_window
+from .instrumentation import Record, add_records, device_label, measure, profile
+from .parse import ENGINES, first_and_last_timestamps, number_of_columns, parse_csv, parse_text, split_header
+
+MESSAGE_SUFFIXES = (".csv", *(f".csv{s}" for s in compression.SUFFIXES), *binary.FORMATS.values())  # files written by write() are read without text parsing
 
 
 def __read_command(directory: Path) -> list[dict[str, Any]]:
@@ -60,65 +72,203 @@ def __parse_time(command: list[dict[str, Any]]) -> datetime | None:
     return None
 
 
-def __read_csv(directory: Path, message_type: DataMessageType, filter: tuple[DataMessageType, ...]) -> np.ndarray:
-    csv = np.empty([0, 10])  # 10 is the maximum number of columns expected for any data message
-    string = np.empty([0, 1])
+def read_device_info(directory: Path) -> tuple[list[dict[str, Any]], str | None, str | None, str | None, datetime | None]:
+    command = __read_command(directory)
 
-    if message_type not in filter:
-        return csv, string
+    interface, device_name, serial_number = __parse_ping(command)
 
-    file_path = directory / message_type.file_name
+    time = __parse_time(command)
+
+    return command, interface, device_name, serial_number, time
+
+
+def __empty() -> tuple[np.ndarray, np.ndarray]:
+    return np.empty([0, 10]), np.empty([0, 1])  # 10 is the maximum number of columns expected for any data message
+
+
+def message_file_paths(directory: Path, filter: tuple[DataMessageType, ...]) -> dict[DataMessageType, Path]:
+    file_paths = {}
+
+    for message_type in filter:
+        for suffix in MESSAGE_SUFFIXES:
+            file_path = directory / f"{Path(message_type.file_name).stem}{suffix}"
+
+            if file_path.is_file():
+                file_paths[message_type] = file_path
+                break
+
+    return file_paths
+
+
+def __crop_csv(csv: np.ndarray, string: np.ndarray, start: int, stop: int) -> tuple[np.ndarray, np.ndarray]:
+    mask = (csv[:, 0] >= start) & (csv[:, 0] <= stop)
+
+    return csv[mask], string[mask] if len(string) > 0 else string
+
+
+def __parse_csv(
+    file_path: Path,
+    message_type: DataMessageType,
+    engine: str,
+    cache: bool,
+    mmap: bool = False,
+    start: int = 0,
+    stop: int = 2**64 - 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    window = (start, stop) != (0, 2**64 - 1)
+
+    if file_path.suffix in binary.FORMATS.values():
+        csv, string = binary.read_message(file_path)
+
+        return __crop_csv(csv, string, start, stop) if window else (csv, string)
+
+    if cache:
+        key = cache_key(file_path)
+
+        if (cached := load_cache(file_path, key, mmap or window)) is not None:
+            return __crop_csv(*cached, start, stop) if window else cached
+
+    index = get_index(file_path, cache) if window and not compression.is_compressed(file_path) else None
+
+    if index is not None and is_monotonic(index):
+        header, data = read_window(file_path, index, start, stop)  # only rows near the window are parsed
+    else:  # timestamps that reset cannot be searched so the whole file is parsed and masked
+        header, data = split_header(compression.read_bytes(file_path))  # compressed files are decompressed in memory
+
+    if message_type in (DataMessageType.NOTIFICATION, DataMessageType.ERROR):
+        csv, string = parse_text(data)
+    else:
+        csv = parse_csv(data, number_of_columns(header), engine)
+        string = np.empty([0, 1])
+
+    if window:
+        return __crop_csv(csv, string, start, stop)  # compressed files are parsed in full as they cannot be seeked
+
+    if cache:
+        save_cache(file_path, key, csv, string)
+
+    return csv, string
+
+
+def __read_csv(file_path: Path, result: Callable[[], tuple[np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray]:
+    with measure("read_csv", file_path.stem) as record:
+        try:
+            csv, string = result()
+        except Exception as _:
+            print(f"Unable to read file {file_path}")
+
+            return __empty()
+
+        record.rows = len(csv)
+        record.bytes = compression.file_size(file_path)
 
-    if not file_path.is_file():
         return csv, string
 
-    try:
-        csv = np.genfromtxt(file_path, delimiter=",", skip_header=1, ndmin=2)
 
-        if message_type in (DataMessageType.NOTIFICATION, DataMessageType.ERROR):
-            string = np.genfromtxt(file_path, delimiter=",", skip_header=1, usecols=1, dtype=None, encoding=None)  # TODO: support strings containing commas
+def __read_csvs(file_paths: dict[DataMessageType, Path], label: str | None, engine: str, cache: bool, start: int, stop: int) -> dict[DataMessageType, tuple[np.ndarray, np.ndarray]]:
+    with device_label(label):
+        return {t: __read_csv(p, partial(__parse_csv, p, t, engine, cache, False, start, stop)) for t, p in file_paths.items()}
+
+
+def __read_worker_csv(file_path: Path, label: str | None, message_type: DataMessageType, engine: str, cache: bool, start: int, stop: int) -> tuple[tuple[np.ndarray, np.ndarray], list[Record]]:
+    with profile() as worker_profile, device_label(label):  # timed in the worker so that records do not include time spent waiting for the result
+        return __read_csv(file_path, partial(__parse_csv, file_path, message_type, engine, cache, False, start, stop)), worker_profile.records
+
+
+def __worker_result(file_path: Path, result: Callable[[], tuple[tuple[np.ndarray, np.ndarray], list[Record]]]) -> tuple[np.ndarray, np.ndarray]:
+    try:
+        csvs, records = result()
     except Exception as _:
         print(f"Unable to read file {file_path}")
 
-    return csv, string
+        return __empty()
 
+    add_records(records)
 
-def __read_device(directory: Path, filter: tuple[DataMessageType, ...]) -> Device:
-    command = __read_command(directory)
+    return csvs
 
-    interface, device_name, serial_number = __parse_ping(command)
 
-    time = __parse_time(command)
+def __read_device(info: tuple, csvs: dict[DataMessageType, tuple[np.ndarray, np.ndarray]], compact: bool) -> Device:
+    command, interface, device_name, serial_number, time = info
 
-    device = Device(
-        command,
-        interface,
-        device_name,
-        serial_number,
-        time,
-        Inertial(*__read_csv(directory, DataMessageType.INERTIAL, filter)),
-        Magnetometer(*__read_csv(directory, DataMessageType.MAGNETOMETER, filter)),
-        Quaternion(*__read_csv(directory, DataMessageType.QUATERNION, filter)),
-        RotationMatrix(*__read_csv(directory, DataMessageType.ROTATION_MATRIX, filter)),
-        EulerAngles(*__read_csv(directory, DataMessageType.EULER_ANGLES, filter)),
-        LinearAcceleration(*__read_csv(directory, DataMessageType.LINEAR_ACCELERATION, filter)),
-        EarthAcceleration(*__read_csv(directory, DataMessageType.EARTH_ACCELERATION, filter)),
-        AhrsStatus(*__read_csv(directory, DataMessageType.AHRS_STATUS, filter)),
-        HighGAccelerometer(*__read_csv(directory, DataMessageType.HIGH_G_ACCELEROMETER, filter)),
-        Temperature(*__read_csv(directory, DataMessageType.TEMPERATURE, filter)),
-        Battery(*__read_csv(directory, DataMessageType.BATTERY, filter)),
-        Rssi(*__read_csv(directory, DataMessageType.RSSI, filter)),
-        SerialAccessory(*__read_csv(directory, DataMessageType.SERIAL_ACCESSORY, filter)),
-        Notification(*__read_csv(directory, DataMessageType.NOTIFICATION, filter)),
-        Error(*__read_csv(directory, DataMessageType.ERROR, filter)),
-        None,
-        None,
-    )
+    with device_label(serial_number), measure("read_device") as record:
+        device = Device(
+            command,
+            interface,
+            device_name,
+            serial_number,
+            time,
+            Inertial(*csvs.get(DataMessageType.INERTIAL, __empty())),
+            Magnetometer(*csvs.get(DataMessageType.MAGNETOMETER, __empty())),
+            Quaternion(*csvs.get(DataMessageType.QUATERNION, __empty())),
+            RotationMatrix(*csvs.get(DataMessageType.ROTATION_MATRIX, __empty())),
+            EulerAngles(*csvs.get(DataMessageType.EULER_ANGLES, __empty())),
+            LinearAcceleration(*csvs.get(DataMessageType.LINEAR_ACCELERATION, __empty())),
+            EarthAcceleration(*csvs.get(DataMessageType.EARTH_ACCELERATION, __empty())),
+            AhrsStatus(*csvs.get(DataMessageType.AHRS_STATUS, __empty())),
+            HighGAccelerometer(*csvs.get(DataMessageType.HIGH_G_ACCELEROMETER, __empty())),
+            Temperature(*csvs.get(DataMessageType.TEMPERATURE, __empty())),
+            Battery(*csvs.get(DataMessageType.BATTERY, __empty())),
+            Rssi(*csvs.get(DataMessageType.RSSI, __empty())),
+            SerialAccessory(*csvs.get(DataMessageType.SERIAL_ACCESSORY, __empty())),
+            Notification(*csvs.get(DataMessageType.NOTIFICATION, __empty())),
+            Error(*csvs.get(DataMessageType.ERROR, __empty())),
+            None,
+            None,
+        )
+
+        if compact:
+            device = replace(device, **{t.name.lower(): compact_message(getattr(device, t.name.lower())) for t in DataMessageType})
+
+        device = update_first_and_last_timestamps(device)
+
+        record.rows = sum(len(c) for c, _ in csvs.values())
+
+        return device
+
+
+def __read_message(message_type: DataMessageType, file_path: Path | None, label: str | None, engine: str, cache: bool, compact: bool) -> DataMessage:
+    if file_path is None:
+        message = MESSAGE_CLASSES[message_type](*__empty())
+    else:
+        with device_label(label):
+            message = MESSAGE_CLASSES[message_type](*__read_csv(file_path, partial(__parse_csv, file_path, message_type, engine, cache, True)))
 
-    return update_first_and_last_timestamps(device)
+    return compact_message(message) if compact else message
 
 
-def read(path: Path, filter: DataMessageType | tuple[DataMessageType, ...] = tuple(DataMessageType)) -> list[Device]:
+def __read_lazy_device(directory: Path, file_paths: dict[DataMessageType, Path], engine: str, cache: bool, compact: bool) -> Device:
+    command, interface, device_name, serial_number, time = read_device_info(directory)
+
+    timestamps = [binary.first_and_last_timestamps(p) if p.suffix in binary.FORMATS.values() else first_and_last_timestamps(p) for p in file_paths.values()]  # head and tail of each file
+
+    timestamps = [t for t in timestamps if t is not None]
+
+    return lazy_device(
+        {
+            "command": command,
+            "interface": interface,
+            "device_name": device_name,
+            "serial_number": serial_number,
+            "time": time,
+            "first_timestamp": min(t[0] for t in timestamps) if timestamps else None,
+            "last_timestamp": max(t[1] for t in timestamps) if timestamps else None,
+        },
+        {t.name.lower(): partial(__read_message, t, file_paths.get(t), serial_number, engine, cache, compact) for t in DataMessageType},
+    )
+
+
+def read(
+    path: Path,
+    filter: DataMessageType | tuple[DataMessageType, ...] = tuple(DataMessageType),
+    engine: str = "fast",
+    workers: int | None = 1,
+    cache: bool = False,
+    lazy: bool = False,
+    start: int = 0,
+    stop: int = 2**64 - 1,
+    compact: bool = False,
+) -> list[Device]:
     path = Path(path)
 
     if not path.is_absolute():
@@ -127,15 +277,45 @@ def read(path: Path, filter: DataMessageType | tuple[DataMessageType, ...] = tup
     if not path.exists():
         raise ValueError(f'"{path}" does not exist')
 
+    if path.is_file() and path.suffix == ".zip":  # zipped session read without extracting
+        path = compression.open_archive(path)
+
+        cache = False  # caches cannot be written inside archives
+
     if not path.is_dir():
         raise ValueError(f'"{path}" is not a directory')
 
     if isinstance(filter, DataMessageType):
         filter = (filter,)
 
+    if engine not in ENGINES:
+        raise ValueError(f'Invalid engine "{engine}". Must be one of {ENGINES}')
+
+    if lazy and (start, stop) != (0, 2**64 - 1):
+        raise ValueError("Start and stop cannot be used with lazy")
+
     device_directories = [d for d in path.iterdir() if d.is_dir() and not d.name.startswith(".")]
 
     if not device_directories:
         raise ValueError(f'"{path}" is empty')
 
-    return [__read_device(d, filter) for d in device_directories]
+    file_paths = [message_file_paths(d, filter) for d in device_directories]
+
+    if lazy:  # data messages are read on first access, memory mapped from the cache if enabled
+        return [__read_lazy_device(d, f, engine, cache, compact) for d, f in zip(device_directories, file_paths)]
+
+    infos = [read_device_info(d) for d in device_directories]
+
+    labels = [i[3] for i in infos]  # serial numbers label records as in the processing functions
+
+    if workers == 1:
+        csvs = [__read_csvs(f, l, engine, cache, start, stop) for f, l in zip(file_paths, labels)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # deferred as multiprocessing is slow to import
+
+        with ProcessPoolExecutor(workers) as executor:  # parsing holds the GIL so files are parsed in separate processes
+            futures = [{t: (p, executor.submit(__read_worker_csv, p, l, t, engine, cache, start, stop)) for t, p in f.items()} for f, l in zip(file_paths, labels)]
+
+            csvs = [{t: __worker_result(p, r.result) for t, (p, r) in f.items()} for f in futures]  # results are collected in submission order
+
+    return [__read_device(i, c, compact) for i, c in zip(infos, csvs)]
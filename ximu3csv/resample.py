@@ -1,99 +1,239 @@
 from dataclasses import replace
 
 import numpy as np
-import scipy
 
+from . import quaternion
 from .data_messages import (
+    MESSAGE_CLASSES,
     DataMessage,
-    EarthAcceleration,
+    DataMessageType,
+    Error,
     EulerAngles,
-    LinearAcceleration,
-    Quaternion,
+    Notification,
+    OrientationMessage,
     RotationMatrix,
+    replace_csv,
 )
 from .device import Device, update_first_and_last_timestamps
+from .instrumentation import device_label, measure
 
+INTERPOLATIONS = ("linear", "slerp", "previous", "nearest")
 
-def __extrapolate(time: np.ndarray, values: np.ndarray, new_time: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    if new_time[0] < time[0]:
-        time = np.concatenate(([new_time[0]], time))
-        values = np.concatenate(([values[0, :]], values))
+COLUMNS = tuple(sorted({c for m in MESSAGE_CLASSES.values() for c in m._COLUMNS}))  # interpolation policies are specified by column name
 
-    if new_time[-1] > time[-1]:
-        time = np.concatenate((time, [new_time[-1]]))
-        values = np.concatenate((values, [values[-1, :]]))
 
-    return time, values
+def __intervals(time: np.ndarray, new_time: np.ndarray, intervals: list[tuple[np.ndarray, tuple]]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    for other_time, interval in intervals:  # messages with identical timestamps share the same intervals
+        if np.array_equal(other_time, time):
+            return interval
 
+    lower = np.clip(np.searchsorted(time, new_time, "right") - 1, 0, len(time) - 1)
+    upper = np.minimum(lower + 1, len(time) - 1)
 
-def __interpolate(time: np.ndarray, values: np.ndarray, new_time: np.ndarray) -> np.ndarray:
-    time, values = __extrapolate(time, values, new_time)
+    period = (time[upper] - time[lower]).astype(float)
 
-    return scipy.interpolate.interp1d(time, values, axis=0)(new_time)
+    weight = np.divide(new_time - time[lower], period, out=np.zeros(len(new_time)), where=period > 0)
 
+    interval = lower, upper, np.clip(weight, 0, 1)  # values are held constant outside of the time range
 
-def __slerp_quaternion(time: np.ndarray, quaternion: np.ndarray, new_time: np.ndarray) -> np.ndarray:
-    time, quaternion = __extrapolate(time, quaternion, new_time)
+    intervals.append((time, interval))
 
-    rotations = scipy.spatial.transform.Rotation.from_quat(quaternion[:, [1, 2, 3, 0]])
+    return interval
 
-    return scipy.spatial.transform.Slerp(time, rotations)(new_time).as_quat()[:, [3, 0, 1, 2]]
 
+def __interpolate(values: np.ndarray, interval: tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    lower, upper, weight = interval
 
-def __slerp_euler_angles(time: np.ndarray, euler_angles: np.ndarray, new_time: np.ndarray) -> np.ndarray:
-    time, euler_angles = __extrapolate(time, euler_angles, new_time)
+    lower_values = values[lower]
 
-    rotations = scipy.spatial.transform.Rotation.from_euler("ZYX", euler_angles[:, [2, 1, 0]], degrees=True)
+    return lower_values + weight[:, np.newaxis] * (values[upper] - lower_values)
 
-    return scipy.spatial.transform.Slerp(time, rotations)(new_time).as_euler("ZYX", degrees=True)[:, [2, 1, 0]]
 
+def __previous(values: np.ndarray, interval: tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    lower, _, _ = interval
 
-def __slerp_rotation_matrix(time: np.ndarray, rotation_matrix: np.ndarray, new_time: np.ndarray) -> np.ndarray:
-    time, rotation_matrix = __extrapolate(time, rotation_matrix, new_time)
+    return values[lower]
 
-    rotations = scipy.spatial.transform.Rotation.from_matrix(rotation_matrix.reshape(-1, 3, 3))
 
-    return scipy.spatial.transform.Slerp(time, rotations)(new_time).as_matrix().reshape(-1, 9)
+def __nearest(values: np.ndarray, interval: tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    lower, upper, weight = interval
 
+    return values[np.where(weight > 0.5, upper, lower)]
 
-def __resample(message: DataMessage, timestamp: np.ndarray) -> DataMessage:
-    if len(message.timestamp) == 0:
-        return message
 
-    if isinstance(message, (Quaternion, LinearAcceleration, EarthAcceleration)):
-        csv = np.column_stack(
-            (
-                timestamp,
-                __slerp_quaternion(message.timestamp / 1e6, message._csv[:, 1:5], timestamp / 1e6),
-                __interpolate(message.timestamp / 1e6, message._csv[:, 5:], timestamp / 1e6),
-            )
-        )
-    elif isinstance(message, EulerAngles):
-        csv = np.column_stack(
-            (
-                timestamp,
-                __slerp_euler_angles(message.timestamp / 1e6, message._csv[:, 1:], timestamp / 1e6),
-            )
-        )
-    elif isinstance(message, RotationMatrix):
-        csv = np.column_stack(
-            (
-                timestamp,
-                __slerp_rotation_matrix(message.timestamp / 1e6, message._csv[:, 1:], timestamp / 1e6),
-            )
-        )
+def __slerp(wxyz: np.ndarray, interval: tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    lower, upper, weight = interval
+
+    a = wxyz[lower]  # quaternions are normalised
+    b = wxyz[upper]
+
+    dot = np.einsum("ij,ij->i", a, b)
+
+    np.negative(b, out=b, where=(dot < 0)[:, np.newaxis])  # shortest path
+    np.abs(dot, out=dot)
+
+    angle = np.arccos(np.minimum(dot, 1))
+    sin_angle = np.sin(angle)
+
+    nlerp = sin_angle < 1e-6  # avoid division by zero for nearly identical quaternions
+
+    np.copyto(sin_angle, 1, where=nlerp)
+
+    a_weight = np.where(nlerp, 1 - weight, np.sin((1 - weight) * angle) / sin_angle)
+    b_weight = np.where(nlerp, weight, np.sin(weight * angle) / sin_angle)
+
+    a *= a_weight[:, np.newaxis]
+    a += b_weight[:, np.newaxis] * b
+
+    a /= np.linalg.norm(a, axis=1, keepdims=True)
+
+    return a
+
+
+def __slerp_orientation(message: OrientationMessage, interval: tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    wxyz = __slerp(message.as_quaternion, interval)
+
+    if isinstance(message, EulerAngles):
+        return quaternion.to_euler_angles(wxyz)
+
+    if isinstance(message, RotationMatrix):
+        return quaternion.to_rotation_matrix(wxyz)
+
+    return wxyz
+
+
+def __columns(csv: np.ndarray, indices: list[int]) -> np.ndarray:
+    if indices == list(range(indices[0], indices[-1] + 1)):
+        return csv[:, indices[0] : indices[-1] + 1]  # contiguous columns are not copied
+
+    return csv[:, indices]
+
+
+def __policies(message: DataMessage, interpolation: dict[str, str] | None) -> dict[str, list[int]]:
+    names, _ = message._payload()
+
+    policies = {**message._INTERPOLATION, **(interpolation or {})}
+
+    indices = {}
+
+    for index in range(1, message._csv.shape[1]):
+        policy = policies.get(names[index - 1], "linear") if index <= len(names) else "linear"
+
+        indices.setdefault(policy, []).append(index)
+
+    if "slerp" in indices:
+        orientation = [i for i, n in enumerate(names, 1) if message._INTERPOLATION.get(n) == "slerp"]
+
+        if not orientation:
+            raise ValueError(f'Interpolation "slerp" cannot be used for {type(message).__name__} columns')
+
+        if indices["slerp"] != orientation:
+            raise ValueError(f'Interpolation "slerp" must be used for all or none of the {type(message).__name__} columns {tuple(names[i - 1] for i in orientation)}')
+
+    return indices
+
+
+def __snap(message: DataMessage, event_time: np.ndarray, timestamp: np.ndarray, new_time: np.ndarray, tolerance: float | None) -> DataMessage:
+
+    if len(new_time) == 0:
+        keep = np.zeros(len(event_time), dtype=bool)
+        nearest = np.zeros(0, dtype=int)
     else:
-        csv = np.column_stack(
-            (
-                timestamp,
-                __interpolate(message.timestamp / 1e6, message._csv[:, 1:], timestamp / 1e6),
-            )
-        )
+        nearest = __nearest(np.arange(len(new_time)), __intervals(new_time, event_time, []))  # events outside the new range are moved to the first or last new timestamp
+
+        keep = np.ones(len(event_time), dtype=bool) if tolerance is None else np.abs(event_time - new_time[nearest]) <= tolerance
+
+    if not np.all(keep):
+        print(f"{np.count_nonzero(~keep)} {type(message).__name__} events removed as not within tolerance of a new timestamp")
+
+    csv = np.column_stack((timestamp[nearest[keep]], message._csv[keep, 1:]))
+
+    return replace(replace_csv(message, csv), _string=message._string[keep] if len(message._string) > 0 else message._string)
+
 
-    return replace(message, _csv=csv)
+def __distance(policy: str, time: np.ndarray, new_time: np.ndarray, interval: tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+    lower, upper, weight = interval
 
+    match policy:
+        case "previous":
+            distance = (new_time - time[lower]).astype(float)
+
+            distance[new_time < time[0]] = np.nan  # no sample at or before, never within tolerance
+
+            return distance
+        case "nearest":
+            return np.abs(new_time - time[np.where(weight > 0.5, upper, lower)]).astype(float)
+        case _:
+            return np.minimum(np.abs(new_time - time[lower]), np.abs(time[upper] - new_time)).astype(float)  # interpolated from either sample
+
+
+def validate_interpolation(interpolation: dict[str, str] | None) -> None:
+    for column, policy in (interpolation or {}).items():
+        if column not in COLUMNS:
+            raise ValueError(f'Invalid column "{column}". Must be one of {COLUMNS}')
+
+        if policy not in INTERPOLATIONS:
+            raise ValueError(f'Invalid interpolation "{policy}". Must be one of {INTERPOLATIONS}')
+
+
+def resample_message(
+    message: DataMessage,
+    timestamp: np.ndarray,
+    intervals: list[tuple[np.ndarray, tuple]],
+    offset: float = 0,
+    interpolation: dict[str, str] | None = None,
+    tolerance: float | None = None,
+) -> DataMessage:
+    time = message.timestamp  # allocated on each access when the message has an offset
+
+    if len(time) == 0:
+        return message
+
+    with measure("resample", type(message).__name__) as record:
+        new_time = timestamp + offset if offset else timestamp  # offset maps new timestamps to message timestamps
+
+        if isinstance(message, (Notification, Error)):  # events are moved to the nearest new timestamp rather than interpolated
+            message = __snap(message, time, timestamp, new_time, tolerance)
+
+            record.rows = len(message._csv)
+
+            return message
+
+        interval = __intervals(time, new_time, intervals)
+
+        csv = np.empty((len(timestamp), message._csv.shape[1]))
+
+        csv[:, 0] = timestamp
+
+        for policy, indices in __policies(message, interpolation).items():
+            rows = None if tolerance is None else ~(__distance(policy, time, new_time, interval) <= tolerance)  # no sample within tolerance
+
+            match policy:
+                case "linear":
+                    csv[:, indices] = __interpolate(__columns(message._csv, indices), interval)
+                case "slerp":
+                    csv[:, indices] = __slerp_orientation(message, interval)
+                case "previous":
+                    csv[:, indices] = __previous(__columns(message._csv, indices), interval)
+                case "nearest":
+                    csv[:, indices] = __nearest(__columns(message._csv, indices), interval)
+
+            if rows is not None:
+                csv[np.ix_(rows, indices)] = np.nan
+
+        record.rows = len(csv)
+
+        return replace_csv(message, csv)
+
+
+def __resample_device(device: Device, timestamp: np.ndarray, intervals: list[tuple[np.ndarray, tuple]], interpolation: dict[str, str] | None) -> Device:
+    with device_label(device.serial_number):
+        return replace(device, **{t.name.lower(): resample_message(getattr(device, t.name.lower()), timestamp, intervals, 0, interpolation) for t in DataMessageType})
+
+
+def resample(devices: list[Device], sample_rate: float, interpolation: dict[str, str] | None = None) -> list[Device]:
+    validate_interpolation(interpolation)
 
-def resample(devices: list[Device], sample_rate: float) -> list[Device]:
     first_timestamps = [d.first_timestamp for d in devices if d.first_timestamp is not None]
     last_timestamps = [d.last_timestamp for d in devices if d.last_timestamp is not None]
 
@@ -108,23 +248,37 @@ def resample(devices: list[Device], sample_rate: float) -> list[Device]:
 
     timestamp = np.arange(first_timestamp, last_timestamp, 1e6 / sample_rate)
 
-    devices = [
-        replace(
-            d,
-            inertial=__resample(d.inertial, timestamp),
-            magnetometer=__resample(d.magnetometer, timestamp),
-            quaternion=__resample(d.quaternion, timestamp),
-            rotation_matrix=__resample(d.rotation_matrix, timestamp),
-            euler_angles=__resample(d.euler_angles, timestamp),
-            linear_acceleration=__resample(d.linear_acceleration, timestamp),
-            earth_acceleration=__resample(d.earth_acceleration, timestamp),
-            high_g_accelerometer=__resample(d.high_g_accelerometer, timestamp),
-            temperature=__resample(d.temperature, timestamp),
-            battery=__resample(d.battery, timestamp),
-            rssi=__resample(d.rssi, timestamp),
-            serial_accessory=__resample(d.serial_accessory, timestamp),
-        )
-        for d in devices
-    ]
+    intervals = []
+
+    devices = [__resample_device(d, timestamp, intervals, interpolation) for d in devices]
 
     return [update_first_and_last_timestamps(d) for d in devices]
+
+
+def join_asof(
+    devices: list[Device],
+    timestamp: np.ndarray,
+    filter: DataMessageType | tuple[DataMessageType, ...] = tuple(DataMessageType),
+    interpolation: dict[str, str] | None = None,
+    tolerance: float | None = None,
+) -> list[Device]:
+    validate_interpolation(interpolation)
+
+    if isinstance(filter, DataMessageType):
+        filter = (filter,)
+
+    timestamp = np.asarray(timestamp, dtype=float)
+
+    interpolation = {**dict.fromkeys(COLUMNS, "previous"), **(interpolation or {})}  # latest sample at or before each timestamp unless specified
+
+    tolerance = np.inf if tolerance is None else tolerance  # rows without a sample at or before are NaN, unlike resample() which holds the first sample
+
+    intervals = []  # only the filtered messages are aligned so no common grid is built
+
+    joined = []
+
+    for device in devices:
+        with device_label(device.serial_number):
+            joined.append(replace(device, **{t.name.lower(): resample_message(getattr(device, t.name.lower()), timestamp, intervals, 0, interpolation, tolerance) for t in filter}))
+
+    return [update_first_and_last_timestamps(d) for d in joined]
@@ -0,0 +1,169 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from .data_messages import MESSAGE_CLASSES, DataMessageType
+from .device import Device, update_first_and_last_timestamps
+from .parse import ENGINES, number_of_columns, parse_csv, parse_text
+from .read import read_device_info
+
+
+@dataclass
+class _GrowthBuffer:
+    array: np.ndarray | None = None
+    length: int = 0
+
+    def extend(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+
+        if self.array is None:
+            self.array = np.empty((0,) + values.shape[1:], dtype=values.dtype)
+
+        dtype = np.result_type(self.array, values)  # strings may widen
+
+        if self.length + len(values) > len(self.array) or dtype != self.array.dtype:
+            array = np.empty((max(2 * len(self.array), self.length + len(values)),) + values.shape[1:], dtype=dtype)  # amortised growth
+
+            array[: self.length] = self.array[: self.length]
+
+            self.array = array
+
+        self.array[self.length : self.length + len(values)] = values
+
+        self.length += len(values)
+
+    def view(self, empty: np.ndarray) -> np.ndarray:
+        if self.array is None:
+            return empty
+
+        return self.array[: self.length]  # later appends never modify existing rows so views remain immutable
+
+
+@dataclass
+class _Stream:
+    offset: int = 0  # bytes of complete lines consumed
+    columns: int | None = None
+    csv: _GrowthBuffer = field(default_factory=_GrowthBuffer)
+    string: _GrowthBuffer = field(default_factory=_GrowthBuffer)
+
+
+class Session:
+    def __init__(self, path: Path, filter: DataMessageType | tuple[DataMessageType, ...] = tuple(DataMessageType), engine: str = "fast") -> None:
+        path = Path(path)
+
+        if not path.is_absolute():
+            path = Path(__import__("__main__").__file__).parent / path
+
+        if not path.exists():
+            raise ValueError(f'"{path}" does not exist')
+
+        if not path.is_dir():
+            raise ValueError(f'"{path}" is not a directory')
+
+        if isinstance(filter, DataMessageType):
+            filter = (filter,)
+
+        if engine not in ENGINES:
+            raise ValueError(f'Invalid engine "{engine}". Must be one of {ENGINES}')
+
+        self.__path = path
+        self.__filter = filter
+        self.__engine = engine
+        self.__streams: dict[Path, dict[DataMessageType, _Stream]] = {}
+        self.__devices: list[Device] = []
+
+        self.refresh()
+
+    @property
+    def devices(self) -> list[Device]:
+        return self.__devices
+
+    def __read_stream(self, file_path: Path, message_type: DataMessageType, stream: _Stream) -> None:
+        with file_path.open("rb") as file:
+            file.seek(stream.offset)
+
+            data = file.read()
+
+        data = data[: data.rfind(b"\n") + 1]  # only complete lines
+
+        if not data:
+            return
+
+        offset = stream.offset + len(data)
+
+        columns = stream.columns
+
+        if columns is None:
+            header, _, data = data.partition(b"\n")
+
+            columns = number_of_columns(header)
+
+        if message_type in (DataMessageType.NOTIFICATION, DataMessageType.ERROR):
+            csv, string = parse_text(data)
+        else:
+            csv = parse_csv(data, columns, self.__engine)
+            string = np.empty([0, 1])
+
+        stream.csv.extend(csv)
+        stream.string.extend(string)
+
+        stream.offset = offset
+        stream.columns = columns
+
+    def refresh(self) -> list[Device]:
+        device_directories = [d for d in self.__path.iterdir() if d.is_dir() and not d.name.startswith(".")]
+
+        if not device_directories:
+            raise ValueError(f'"{self.__path}" is empty')
+
+        for directory in device_directories:
+            streams = self.__streams.setdefault(directory, {})
+
+            for message_type in self.__filter:
+                file_path = directory / message_type.file_name
+
+                if not file_path.is_file():
+                    continue
+
+                if message_type not in streams or file_path.stat().st_size < streams[message_type].offset:  # new or replaced file
+                    streams[message_type] = _Stream()
+
+                try:
+                    self.__read_stream(file_path, message_type, streams[message_type])
+                except Exception as _:
+                    print(f"Unable to read file {file_path}")
+
+        self.__devices = [self.__device(d) for d in self.__streams]
+
+        return self.__devices
+
+    def __device(self, directory: Path) -> Device:
+        messages = {}
+
+        for message_type in DataMessageType:
+            stream = self.__streams[directory].get(message_type, _Stream())
+
+            messages[message_type.name.lower()] = MESSAGE_CLASSES[message_type](
+                stream.csv.view(np.empty([0, 10])),
+                stream.string.view(np.empty([0, 1])),
+            )
+
+        try:
+            command, interface, device_name, serial_number, time = read_device_info(directory)
+        except ValueError:  # Command.json may be incomplete while being written
+            command, interface, device_name, serial_number, time = [], None, None, None, None
+
+        device = Device(
+            command=command,
+            interface=interface,
+            device_name=device_name,
+            serial_number=serial_number,
+            time=time,
+            **messages,
+            first_timestamp=None,
+            last_timestamp=None,
+        )
+
+        return update_first_and_last_timestamps(device)  # only reads the first and last row of each message
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+from . import binary
+from .data_messages import DataMessageType
+from .device import Device
+
+
+def __directory_name(device: Device, index: int) -> str:
+    if device.device_name is None or device.serial_number is None:
+        return f"Device {index}"
+
+    return f"{device.device_name} - {device.serial_number}"
+
+
+def write(devices: list[Device], path: Path, format: str = "npz") -> None:
+    path = Path(path)
+
+    if not path.is_absolute():
+        path = Path(__import__("__main__").__file__).parent / path
+
+    if format not in binary.FORMATS:
+        raise ValueError(f'Invalid format "{format}". Must be one of {tuple(binary.FORMATS)}')
+
+    for index, device in enumerate(devices):
+        directory = path / __directory_name(device, index)
+
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with (directory / "Command.json").open("w") as file:
+            json.dump(device.command, file, indent=4)
+
+        for message_type in DataMessageType:
+            message = getattr(device, message_type.name.lower())
+
+            for suffix in binary.FORMATS.values():
+                (directory / message_type.file_name).with_suffix(suffix).unlink(missing_ok=True)  # files from an earlier write would otherwise be read in place of this one
+
+            if len(message._csv) == 0:
+                continue  # equivalent to a missing file when read
+
+            binary.write_message((directory / message_type.file_name).with_suffix(binary.FORMATS[format]), message, format)
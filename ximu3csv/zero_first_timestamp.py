@@ -1,24 +1,36 @@
 from dataclasses import replace
+from typing import Any, Iterable, Iterator
 
 import numpy as np
 
 from .data_messages import DataMessage
-from .device import Device, update_first_and_last_timestamps
+from .device import Device
 
 
-def __zero_first_timestamp(message: DataMessage, first_timestamp: int) -> DataMessage:
-    if len(message.timestamp) == 0:
+def __scalar(timestamp: Any) -> Any:
+    return int(timestamp) if isinstance(timestamp, np.integer) else timestamp  # uint64 arithmetic overflows for negative values
+
+
+def zero_first_timestamp_message(message: DataMessage, first_timestamp: int) -> DataMessage:
+    if len(message._csv) == 0:
         return message
 
-    return replace(
-        message,
-        _csv=np.column_stack(
-            (
-                message._csv[:, 0] - first_timestamp,
-                message._csv[:, 1:],
-            ),
-        ),
-    )
+    if message._timestamp is not None:
+        timestamp = message._timestamp.astype(np.int64) - first_timestamp
+
+        if timestamp.min() < 0:
+            raise ValueError(f"First timestamp {first_timestamp} is after timestamp {message._timestamp.min()}. Compact timestamps cannot be negative")
+
+        return replace(message, _timestamp=timestamp.astype(np.uint64))  # payload columns are not copied
+
+    return replace(message, _offset=message._offset + first_timestamp)  # applied by DataMessage.timestamp so no columns are copied
+
+
+def __zero_first_and_last_timestamps(device: Device, first_timestamp: int) -> Device:
+    if device.first_timestamp is None or device.last_timestamp is None:
+        return device
+
+    return replace(device, first_timestamp=__scalar(device.first_timestamp) - first_timestamp, last_timestamp=__scalar(device.last_timestamp) - first_timestamp)  # all messages are shifted equally
 
 
 def zero_first_timestamp(devices: list[Device], offset: int = 0) -> list[Device]:
@@ -27,28 +39,39 @@ def zero_first_timestamp(devices: list[Device], offset: int = 0) -> list[Device]
     if not first_timestamps:
         return devices
 
-    first_timestamp = min(first_timestamps) - offset
+    first_timestamp = __scalar(min(first_timestamps)) - offset
 
     devices = [
         replace(
             d,
-            inertial=__zero_first_timestamp(d.inertial, first_timestamp),
-            magnetometer=__zero_first_timestamp(d.magnetometer, first_timestamp),
-            quaternion=__zero_first_timestamp(d.quaternion, first_timestamp),
-            rotation_matrix=__zero_first_timestamp(d.rotation_matrix, first_timestamp),
-            euler_angles=__zero_first_timestamp(d.euler_angles, first_timestamp),
-            linear_acceleration=__zero_first_timestamp(d.linear_acceleration, first_timestamp),
-            earth_acceleration=__zero_first_timestamp(d.earth_acceleration, first_timestamp),
-            ahrs_status=__zero_first_timestamp(d.ahrs_status, first_timestamp),
-            high_g_accelerometer=__zero_first_timestamp(d.high_g_accelerometer, first_timestamp),
-            temperature=__zero_first_timestamp(d.temperature, first_timestamp),
-            battery=__zero_first_timestamp(d.battery, first_timestamp),
-            rssi=__zero_first_timestamp(d.rssi, first_timestamp),
-            serial_accessory=__zero_first_timestamp(d.serial_accessory, first_timestamp),
-            notification=__zero_first_timestamp(d.notification, first_timestamp),
-            error=__zero_first_timestamp(d.error, first_timestamp),
+            inertial=zero_first_timestamp_message(d.inertial, first_timestamp),
+            magnetometer=zero_first_timestamp_message(d.magnetometer, first_timestamp),
+            quaternion=zero_first_timestamp_message(d.quaternion, first_timestamp),
+            rotation_matrix=zero_first_timestamp_message(d.rotation_matrix, first_timestamp),
+            euler_angles=zero_first_timestamp_message(d.euler_angles, first_timestamp),
+            linear_acceleration=zero_first_timestamp_message(d.linear_acceleration, first_timestamp),
+            earth_acceleration=zero_first_timestamp_message(d.earth_acceleration, first_timestamp),
+            ahrs_status=zero_first_timestamp_message(d.ahrs_status, first_timestamp),
+            high_g_accelerometer=zero_first_timestamp_message(d.high_g_accelerometer, first_timestamp),
+            temperature=zero_first_timestamp_message(d.temperature, first_timestamp),
+            battery=zero_first_timestamp_message(d.battery, first_timestamp),
+            rssi=zero_first_timestamp_message(d.rssi, first_timestamp),
+            serial_accessory=zero_first_timestamp_message(d.serial_accessory, first_timestamp),
+            notification=zero_first_timestamp_message(d.notification, first_timestamp),
+            error=zero_first_timestamp_message(d.error, first_timestamp),
         )
         for d in devices
     ]
 
-    return [update_first_and_last_timestamps(d) for d in devices]
+    return [__zero_first_and_last_timestamps(d, first_timestamp) for d in devices]
+
+
+def zero_first_timestamp_chunks(chunks: Iterable[DataMessage], first_timestamp: int | None = None, offset: int = 0) -> Iterator[DataMessage]:
+    for chunk in chunks:
+        if first_timestamp is None and len(chunk.timestamp) > 0:
+            first_timestamp = chunk.timestamp[0]  # first timestamp of the stream if not specified, e.g. Device.first_timestamp
+
+        if first_timestamp is None:
+            yield chunk
+        else:
+            yield zero_first_timestamp_message(chunk, __scalar(first_timestamp) - offset)
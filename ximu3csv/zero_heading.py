@@ -1,8 +1,9 @@
 from dataclasses import replace
+from typing import Iterable, Iterator
 
 import numpy as np
-import scipy
 
+from . import quaternion
 from .data_messages import (
     DataMessage,
     EarthAcceleration,
@@ -10,68 +11,138 @@ from .data_messages import (
     LinearAcceleration,
     Quaternion,
     RotationMatrix,
+    replace_csv,
 )
 from .device import Device
+from .instrumentation import device_label, measure
 
 
-def __zero_heading_rotations(rotations: list[scipy.spatial.transform.Rotation], index: int, offset: float) -> list[scipy.spatial.transform.Rotation]:
-    angle = offset - rotations[index].as_euler("ZYX", degrees=True)[0]
+def __heading(message: DataMessage, index: int) -> float:
+    if isinstance(message, (Quaternion, LinearAcceleration, EarthAcceleration)):
+        wxyz = message._csv[index : index + 1, 1:5]
 
-    rotations[index:] = scipy.spatial.transform.Rotation.from_euler("Z", angle, degrees=True) * rotations[index:]
+        return quaternion.to_euler_angles(wxyz / np.linalg.norm(wxyz))[0, 2]
 
-    return rotations
+    if isinstance(message, EulerAngles):
+        return message._csv[index, 3]
 
+    if isinstance(message, RotationMatrix):
+        return np.degrees(np.arctan2(message._csv[index, 4], message._csv[index, 1]))  # yaw from yx and xx
 
-def __zero_heading_message(message: DataMessage, timestamp: int, offset: float) -> DataMessage:
-    if len(message.timestamp) == 0:
-        return message
+    raise ValueError(f"{type(message).__name__} is not an orientation message")
 
-    if timestamp > message.timestamp[-1]:
-        return message
 
-    index = np.argmax(message.timestamp >= timestamp)
+def __rotate_heading(message: DataMessage, timestamp: np.ndarray, index: int, angle: float | np.ndarray) -> DataMessage:
+    csv = np.array(message._csv, dtype=float)  # fresh buffer modified in place
+
+    csv[:, 0] = timestamp
+
+    tail = csv[index:]
 
     if isinstance(message, (Quaternion, LinearAcceleration, EarthAcceleration)):
-        rotations = scipy.spatial.transform.Rotation.from_quat(message.quaternion.wxyz[:, [1, 2, 3, 0]])
-
-        csv = np.column_stack(
-            (
-                message.timestamp,
-                __zero_heading_rotations(rotations, index, offset).as_quat()[:, [3, 0, 1, 2]],
-                message._csv[:, 5:],
-            )
-        )
+        csv[:, 1:5] = message.as_quaternion
+
+        cos = np.cos(np.radians(angle) / 2)
+        sin = np.sin(np.radians(angle) / 2)
+
+        w, x, y, z = tail[:, 1:5].T.copy()
+
+        tail[:, 1] = cos * w - sin * z  # yaw quaternion (cos, 0, 0, sin) multiplied on the left
+        tail[:, 2] = cos * x - sin * y
+        tail[:, 3] = cos * y + sin * x
+        tail[:, 4] = cos * z + sin * w
+
     elif isinstance(message, EulerAngles):
-        rotations = scipy.spatial.transform.Rotation.from_euler("ZYX", message.euler_angles[:, [2, 1, 0]], degrees=True)
+        tail[:, 3] = (tail[:, 3] + angle + 180) % 360 - 180
 
-        csv = np.column_stack(
-            (
-                message.timestamp,
-                __zero_heading_rotations(rotations, index, offset).as_euler("ZYX", degrees=True)[:, [2, 1, 0]],
-            )
-        )
     elif isinstance(message, RotationMatrix):
-        rotations = scipy.spatial.transform.Rotation.from_matrix(message.rotation_matrix.reshape(-1, 3, 3))
+        cos = np.cos(np.radians(angle))[..., np.newaxis]
+        sin = np.sin(np.radians(angle))[..., np.newaxis]
 
-        csv = np.column_stack(
-            (
-                message.timestamp,
-                __zero_heading_rotations(rotations, index, offset).as_matrix().reshape(-1, 9),
-            )
-        )
+        x_row = tail[:, 1:4].copy()
+        y_row = tail[:, 4:7].copy()
+
+        tail[:, 1:4] = cos * x_row - sin * y_row  # yaw rotation matrix multiplied on the left
+        tail[:, 4:7] = sin * x_row + cos * y_row
+
+    return replace_csv(message, csv)
+
+
+def __zero_heading_message(message: DataMessage, events: list[tuple[int, float]]) -> DataMessage:
+    if len(message._csv) == 0:
+        return message
+
+    with measure("zero_heading", type(message).__name__) as record:
+        timestamp = message.timestamp
+
+        indices = []
+        angles = []
 
-    return replace(message, _csv=csv)
+        for event_timestamp, offset in events:
+            if event_timestamp > timestamp[-1]:
+                break
 
+            index = int(np.searchsorted(timestamp, event_timestamp, "left"))
 
-def zero_heading(devices: list[Device], timestamp: int = 0, offset: float = 0) -> list[Device]:
-    return [
-        replace(
-            d,
-            quaternion=__zero_heading_message(d.quaternion, timestamp, offset),
-            rotation_matrix=__zero_heading_message(d.rotation_matrix, timestamp, offset),
-            euler_angles=__zero_heading_message(d.euler_angles, timestamp, offset),
-            linear_acceleration=__zero_heading_message(d.linear_acceleration, timestamp, offset),
-            earth_acceleration=__zero_heading_message(d.earth_acceleration, timestamp, offset),
+            indices.append(index)
+            angles.append(offset - __heading(message, index))  # each event overrides previous events from its index
+
+        if not indices:
+            return message
+
+        if len(indices) == 1:
+            angle = angles[0]
+        else:
+            angle = np.repeat(angles, np.diff(indices + [len(timestamp)]))  # angle of each sample from the first event
+
+        record.rows = len(timestamp) - indices[0]
+
+        return __rotate_heading(message, timestamp, indices[0], angle)
+
+
+def __zero_heading_device(device: Device, events: list[tuple[int, float]]) -> Device:
+    with device_label(device.serial_number):
+        return replace(
+            device,
+            quaternion=__zero_heading_message(device.quaternion, events),
+            rotation_matrix=__zero_heading_message(device.rotation_matrix, events),
+            euler_angles=__zero_heading_message(device.euler_angles, events),
+            linear_acceleration=__zero_heading_message(device.linear_acceleration, events),
+            earth_acceleration=__zero_heading_message(device.earth_acceleration, events),
         )
-        for d in devices
-    ]
+
+
+def zero_heading(devices: list[Device], timestamp: int | list[int] = 0, offset: float | list[float] = 0) -> list[Device]:
+    timestamps = timestamp if isinstance(timestamp, (list, tuple)) else [timestamp]
+    offsets = offset if isinstance(offset, (list, tuple)) else [offset] * len(timestamps)
+
+    if len(timestamps) != len(offsets):
+        raise ValueError(f"Number of timestamps {len(timestamps)} does not match number of offsets {len(offsets)}")
+
+    events = sorted(zip(timestamps, offsets), key=lambda e: e[0])
+
+    return [__zero_heading_device(d, events) for d in devices]
+
+
+def zero_heading_chunks(chunks: Iterable[DataMessage], timestamp: int = 0, offset: float = 0) -> Iterator[DataMessage]:
+    angle = None  # heading correction is determined by the first sample at or after the timestamp
+
+    for chunk in chunks:
+        if len(chunk._csv) == 0:
+            yield chunk
+            continue
+
+        chunk_timestamp = chunk.timestamp  # allocated on each access when the chunk has an offset
+
+        if angle is None:
+            if timestamp > chunk_timestamp[-1]:
+                yield chunk
+                continue
+
+            index = int(np.searchsorted(chunk_timestamp, timestamp, "left"))
+
+            angle = offset - __heading(chunk, index)
+        else:
+            index = 0
+
+        yield __rotate_heading(chunk, chunk_timestamp, index, angle)